@@ -3,8 +3,9 @@
 ddb_convert - Convert between DynamoDB JSON format and normal JSON format
 
 Usage:
-    ddb_convert.py from-ddb [-i/--input <input_file>] [-o/--output <output_file>] [-p/--pretty]
-    ddb_convert.py to-ddb [-i/--input <input_file>] [-o/--output <output_file>] [-p/--pretty] [--without-item]
+    ddb_convert.py from-ddb [-i/--input <input_file>] [-o/--output <output_file>] [-p/--pretty] [-j/--jobs <n>]
+    ddb_convert.py to-ddb [-i/--input <input_file>] [-o/--output <output_file>] [-p/--pretty] [-j/--jobs <n>]
+                          [--without-item]
     ddb_convert.py --help
 
 Commands:
@@ -16,6 +17,7 @@ Options:
     -o/--output <file>   Output file path (default: stdout)
     -p/--pretty          Pretty print output JSON
     --without-item       Omit top-level "Item" wrapper (only applies to to-ddb mode)
+    -j/--jobs <n>        Number of worker processes for JSONL input (default: 1)
     -h/--help            Show this help message
 
 Notes:
@@ -24,85 +26,201 @@ Notes:
     - Use --without-item to omit the wrapper
 """
 
-import base64
 import json
 import sys
 import argparse
 import io
-from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, TextIO
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
 
 try:
-    from boto3.dynamodb.types import TypeSerializer, TypeDeserializer, Binary
+    from boto3.dynamodb.types import (
+        TypeSerializer, TypeDeserializer, Binary,
+        NULL, BOOLEAN, NUMBER, STRING, BINARY, NUMBER_SET, STRING_SET, BINARY_SET, MAP, LIST,
+    )
 except ImportError:
     print("Error: boto3 is required. Install it with: pip install boto3", file=sys.stderr)
     sys.exit(1)
 
+# Compiled with mypyc when built, see Makefile
+from ddb_hot import make_json_serializable
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # SIMD accelerated base64 codec
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode
+
+# A run of 19 digits may be an integer beyond 64 bits, which orjson turns into a float
+# without an error. Such input is parsed exactly by the stdlib instead. The runs are
+# found by mapping all digits to "0", which is faster than a regular expression.
+DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+LONG_DIGITS = b"0" * 19
+
+
+def orjson_loads(data: bytes) -> Any:
+    """Parse JSON with orjson, or with the stdlib if it may have integers beyond 64 bits"""
+    if LONG_DIGITS in data.translate(DIGITS_TO_ZERO):
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+# Pick the fastest available JSON library: msgspec, then orjson, then the stdlib
+if msgspec is not None:
+    json_loads = msgspec.json.Decoder().decode
+    # Numbers are already converted by the deserializer, Decimals are still written as JSON
+    # numbers natively and other boto3 types go through the hook
+    msgspec_encoder = msgspec.json.Encoder(enc_hook=make_json_serializable, decimal_format='number')
+    JSON_DECODE_ERRORS = (json.JSONDecodeError, msgspec.DecodeError)
+else:
+    json_loads = orjson_loads if orjson is not None else json.loads
+    JSON_DECODE_ERRORS = (json.JSONDecodeError,)
+
+# JSONL input is read and converted in blocks of this many bytes
+CHUNK_SIZE = 1 << 20
+
 
-def make_json_serializable(obj: Any) -> Any:
+DYNAMODB_TYPES = (NULL, BOOLEAN, NUMBER, STRING, BINARY, NUMBER_SET, STRING_SET, BINARY_SET, MAP, LIST)
+
+
+class FastTypeSerializer(TypeSerializer):
     """
-    Recursively convert Python objects to JSON-serializable types.
-    Handles boto3's output types: set, bytes, Decimal, Binary
+    boto3's TypeSerializer with a dict lookup on the exact Python type instead of
+    the isinstance chain and getattr call done for every value.
+    Floats are accepted and converted to Decimal while serializing numbers.
+    Sets and subclasses fall back to boto3's type detection.
     """
-    if isinstance(obj, set):
-        # Convert set to list, recursively processing items
-        return [make_json_serializable(item) for item in obj]
-    elif isinstance(obj, (bytes, Binary)):
-        # Convert bytes/Binary to base64 string
-        if isinstance(obj, Binary):
-            obj = bytes(obj)  # Convert Binary to bytes
-        return base64.b64encode(obj).decode('utf-8')
-    elif isinstance(obj, Decimal):
-        # Convert Decimal to int or float, preserving original intent
-        # Check string representation: "4" -> int, "4.0" -> float
-        str_repr = str(obj)
-        if '.' in str_repr or 'e' in str_repr.lower():
-            return float(obj)
+
+    TYPE_MAP = {
+        type(None): NULL,
+        bool: BOOLEAN,
+        int: NUMBER,
+        float: NUMBER,
+        Decimal: NUMBER,
+        str: STRING,
+        bytes: BINARY,
+        bytearray: BINARY,
+        Binary: BINARY,
+        dict: MAP,
+        list: LIST,
+        tuple: LIST,
+    }
+
+    def __init__(self):
+        self._serializers = {t: getattr(self, f'_serialize_{t}'.lower()) for t in DYNAMODB_TYPES}
+
+    def serialize(self, value: Any) -> Dict[str, Any]:
+        dynamodb_type = self.TYPE_MAP.get(type(value))
+        if dynamodb_type is None:
+            dynamodb_type = self._get_dynamodb_type(value)
+        return {dynamodb_type: self._serializers[dynamodb_type](value)}
+
+    def _serialize_n(self, value: Any) -> str:
+        # JSON numbers with a fraction are parsed as float, boto3 only takes Decimal
+        if type(value) is float:
+            number = repr(value)
+            # Plain notation such as "2.5" is also what the Decimal path produces, so skip it.
+            # Exponents, infinity and NaN still go through boto3's checks.
+            if '.' in number and 'e' not in number:
+                return number
+            value = Decimal(number)
+        return super()._serialize_n(value)
+
+    def _serialize_l(self, value: Any) -> List[Dict[str, Any]]:
+        # Look up the bound method once instead of for every item.
+        # Strings are the most common values and need no conversion, so they are built inline.
+        serialize = self.serialize
+        return [{STRING: v} if type(v) is str else serialize(v) for v in value]
+
+    def _serialize_m(self, value: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        serialize = self.serialize
+        return {k: {STRING: v} if type(v) is str else serialize(v) for k, v in value.items()}
+
+
+class FastTypeDeserializer(TypeDeserializer):
+    """
+    boto3's TypeDeserializer with a dict lookup on the type tag instead of
+    building a key list and calling getattr for every value.
+    Binary values given as base64 strings are decoded while deserializing.
+    Malformed values fall back to boto3 to get its error messages.
+    """
+
+    def __init__(self):
+        self._deserializers = {t: getattr(self, f'_deserialize_{t}'.lower()) for t in DYNAMODB_TYPES}
+
+    def deserialize(self, value: Dict[str, Any]) -> Any:
+        if value:
+            dynamodb_type = next(iter(value))
+            deserializer = self._deserializers.get(dynamodb_type)
+            if deserializer is not None:
+                return deserializer(value[dynamodb_type])
+        return super().deserialize(value)
+
+    def _deserialize_n(self, value: str) -> Any:
+        # boto3 validates the number and returns a Decimal. It is converted here, with the same
+        # rule as make_json_serializable: "4" -> int, "4.0" and "1E+2" -> float. The encoders
+        # write Decimals as they are, such as 1E+2 or 1.10, instead of 100.0 and 1.1.
+        number = super()._deserialize_n(value)
+        # In plain notation, as most numbers are, the exponent is 0 exactly without a fraction.
+        # Others, such as "1E+2", "5." or values that are not strings, are checked on the Decimal,
+        # which is slower.
+        if type(value) is str and 'e' not in value and 'E' not in value and value[-1:].isdigit():
+            exponent = -1 if '.' in value else 0
         else:
-            return int(obj)
-    elif isinstance(obj, dict):
-        return {k: make_json_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [make_json_serializable(item) for item in obj]
-    else:
-        return obj
+            exponent = number.as_tuple().exponent
+        if exponent == 0:
+            return int(number)
+        return float(number)
+
+    def _deserialize_b(self, value: Any) -> Binary:
+        # DynamoDB JSON carries binary data as base64 text, boto3 expects bytes
+        if isinstance(value, str):
+            value = b64decode(value)
+        return super()._deserialize_b(value)
+
+    def _deserialize_l(self, value: List[Dict[str, Any]]) -> List[Any]:
+        # Look up the bound method once instead of for every item
+        deserialize = self.deserialize
+        return [deserialize(v) for v in value]
+
+    def _deserialize_m(self, value: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        deserialize = self.deserialize
+        return {k: deserialize(v) for k, v in value.items()}
 
 
 class DynamoDBJSONConverter:
     """Converter between DynamoDB JSON format and normal JSON format using boto3"""
 
     def __init__(self):
-        self.serializer = TypeSerializer()
-        self.deserializer = TypeDeserializer()
+        self.serializer = FastTypeSerializer()
+        self.deserializer = FastTypeDeserializer()
 
     def marshall(self, python_obj: Dict[str, Any]) -> Dict[str, Any]:
         """Convert a standard dict into DynamoDB format using boto3's TypeSerializer"""
-        return {k: self.serializer.serialize(v) for k, v in python_obj.items()}
+        # Same as the serializer's map handler, with string values built inline
+        serialize = self.serializer.serialize
+        return {k: {STRING: v} if type(v) is str else serialize(v) for k, v in python_obj.items()}
 
     def unmarshall(self, dynamo_obj: Dict[str, Any]) -> Dict[str, Any]:
         """Convert a DynamoDB dict into standard dict using boto3's TypeDeserializer"""
-        # Preprocess to convert B field string values to bytes if needed
-        preprocessed = self._preprocess_binary_fields(dynamo_obj)
-        return {k: self.deserializer.deserialize(v) for k, v in preprocessed.items()}
-
-    def _preprocess_binary_fields(self, obj: Any) -> Any:
-        """Convert base64 string in B fields to bytes for boto3 compatibility"""
-        if isinstance(obj, dict):
-            if "B" in obj and isinstance(obj["B"], str):
-                # Convert base64 string to bytes
-                return {"B": base64.b64decode(obj["B"])}
-            else:
-                # Recursively process nested structures
-                return {k: self._preprocess_binary_fields(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._preprocess_binary_fields(item) for item in obj]
-        else:
-            return obj
+        deserialize = self.deserializer.deserialize
+        return {k: deserialize(v) for k, v in dynamo_obj.items()}
 
     def to_dynamodb(self, obj: Any, wrap_item: bool = True) -> Dict[str, Any]:
         """Convert normal JSON object to DynamoDB JSON format"""
-        # Convert floats to Decimal as required by boto3
-        obj = self._convert_floats_to_decimal(obj)
+        # Floats are converted to Decimal by the serializer in the same pass
         if isinstance(obj, dict):
             # Handle as a DynamoDB item
             result = self.marshall(obj)
@@ -113,58 +231,98 @@ class DynamoDBJSONConverter:
             # Handle as a single value
             return self.serializer.serialize(obj)
 
-    def _convert_floats_to_decimal(self, obj: Any) -> Any:
-        """Recursively convert float values to Decimal for boto3 compatibility"""
-        if isinstance(obj, float):
-            return Decimal(str(obj))
-        elif isinstance(obj, dict):
-            return {k: self._convert_floats_to_decimal(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_floats_to_decimal(item) for item in obj]
-        else:
-            return obj
-
     def from_dynamodb(self, dynamodb_obj: Dict[str, Any]) -> Dict[str, Any]:
         """Convert DynamoDB JSON format to normal JSON object"""
-        # Check if it has "Item" wrapper and unwrap it
-        if "Item" in dynamodb_obj and len(dynamodb_obj) == 1:
-            dynamodb_obj = dynamodb_obj["Item"]
+        # Check if it has "Item" wrapper and unwrap it, with a single lookup
+        item = dynamodb_obj.get("Item")
+        if item is not None and len(dynamodb_obj) == 1:
+            dynamodb_obj = item
 
         # Unmarshall the DynamoDB item
         return self.unmarshall(dynamodb_obj)
 
 
-def safe_json_dumps(obj: Any, pretty: bool = False, ensure_ascii: bool = False) -> str:
+def safe_json_dumps(obj: Any, pretty: bool = False, ensure_ascii: bool = False) -> bytes:
     """
-    Safely serialize object to JSON string, applying cleanup if needed.
-    Tries direct serialization first, and if it fails, applies make_json_serializable.
+    Safely serialize object to UTF-8 encoded JSON, applying cleanup if needed.
+    Uses msgspec or orjson with make_json_serializable as the hook when available.
+    Otherwise tries direct serialization first, and if it fails, applies make_json_serializable.
     """
+    if msgspec is not None and not ensure_ascii:
+        payload = msgspec_encoder.encode(obj)
+        return msgspec.json.format(payload, indent=2) if pretty else payload
+
+    if orjson is not None and not ensure_ascii:
+        try:
+            option = orjson.OPT_INDENT_2 if pretty else 0
+            return orjson.dumps(obj, default=make_json_serializable, option=option)
+        except orjson.JSONEncodeError:
+            # orjson rejects integers beyond 64 bits, fall back to the stdlib
+            pass
+
     try:
         # Try direct serialization
         if pretty:
-            return json.dumps(obj, indent=2, ensure_ascii=ensure_ascii)
+            json_str = json.dumps(obj, indent=2, ensure_ascii=ensure_ascii)
         else:
-            return json.dumps(obj, ensure_ascii=ensure_ascii, separators=(',', ':'))
+            json_str = json.dumps(obj, ensure_ascii=ensure_ascii, separators=(',', ':'))
     except (TypeError, ValueError):
         # If serialization fails, apply cleanup and try again
         cleaned_obj = make_json_serializable(obj)
         if pretty:
-            return json.dumps(cleaned_obj, indent=2, ensure_ascii=ensure_ascii)
+            json_str = json.dumps(cleaned_obj, indent=2, ensure_ascii=ensure_ascii)
         else:
-            return json.dumps(cleaned_obj, ensure_ascii=ensure_ascii, separators=(',', ':'))
+            json_str = json.dumps(cleaned_obj, ensure_ascii=ensure_ascii, separators=(',', ':'))
+    return json_str.encode('utf-8')
 
 
-def process_jsonl(input_stream: TextIO, output_stream: TextIO, converter: DynamoDBJSONConverter,
-                  mode: str, pretty: bool, without_item: bool, first_line: str = "") -> None:
-    """Process JSONL input line by line"""
+def read_jsonl_blocks(input_stream: BinaryIO, first_line: bytes = b"") -> Iterator[Tuple[List[bytes], int]]:
+    """
+    Read JSONL input in chunks and split them into lines.
+    Yields (lines, number of lines before them) tuples.
+    """
     line_num = 0
+    # The first line was already read during detection, the incomplete last line of a chunk
+    # is carried over to the next one
+    tail = first_line
+
+    # read1 returns what is available instead of waiting for a full chunk, so that lines
+    # from a pipe are converted as they arrive. Streams without read1 are read in full chunks.
+    read = getattr(input_stream, "read1", input_stream.read)
+
+    while True:
+        chunk = read(CHUNK_SIZE)
+        if not chunk:
+            break
+        # Prepend the tail to the first line only instead of copying the whole chunk
+        lines = chunk.split(b'\n')
+        lines[0] = tail + lines[0]
+        tail = lines.pop()
+        yield lines, line_num
+        line_num += len(lines)
+
+    if tail:
+        yield [tail], line_num
+
+
+def convert_jsonl_lines(lines: List[bytes], line_num: int, converter: DynamoDBJSONConverter,
+                        mode: str, pretty: bool, without_item: bool) -> Tuple[bytes, Optional[str]]:
+    """
+    Convert a block of JSONL lines, line_num is the number of lines before the block.
+    Returns (output, error) tuple, the output has the lines converted before an error.
+    """
+    # Collect the converted lines so that the block is joined and written with one call
+    parts = []
+    for line in lines:
+        line_num += 1
+        # The parsers accept surrounding whitespace, so the line is not stripped
+        if not line or line.isspace():
+            # Skip empty lines
+            continue
 
-    # Process the first line that was already read during detection
-    if first_line.strip():
-        line_num = 1
         try:
             # Parse the JSON line
-            input_data = json.loads(first_line)
+            input_data = json_loads(line)
 
             # Convert based on mode
             if mode == 'to-ddb':
@@ -173,53 +331,71 @@ def process_jsonl(input_stream: TextIO, output_stream: TextIO, converter: Dynamo
                 output_data = converter.from_dynamodb(input_data)
 
             # Output the result - safe_json_dumps handles non-serializable types
-            json_str = safe_json_dumps(output_data, pretty=pretty, ensure_ascii=False)
-            output_stream.write(json_str + '\n')
+            parts.append(safe_json_dumps(output_data, pretty=pretty, ensure_ascii=False))
+            parts.append(b'\n')
 
-        except json.JSONDecodeError as e:
-            print(f"Error: Invalid JSON on line {line_num}: {e}", file=sys.stderr)
-            sys.exit(1)
+        except JSON_DECODE_ERRORS as e:
+            return b"".join(parts), f"Error: Invalid JSON on line {line_num}: {e}"
         except Exception as e:
-            print(f"Error processing line {line_num}: {e}", file=sys.stderr)
-            sys.exit(1)
+            return b"".join(parts), f"Error processing line {line_num}: {e}"
 
-    # Process remaining lines
-    for line in input_stream:
-        line_num += 1
-        line = line.strip()
-        if not line:
-            # Skip empty lines
-            continue
+    return b"".join(parts), None
 
-        try:
-            # Parse the JSON line
-            input_data = json.loads(line)
 
-            # Convert based on mode
-            if mode == 'to-ddb':
-                output_data = converter.to_dynamodb(input_data, wrap_item=not without_item)
-            else:  # from-ddb
-                output_data = converter.from_dynamodb(input_data)
+# Converter of a worker process, created once by init_worker
+worker_converter = None
 
-            # Output the result - safe_json_dumps handles non-serializable types
-            json_str = safe_json_dumps(output_data, pretty=pretty, ensure_ascii=False)
-            output_stream.write(json_str + '\n')
 
-        except json.JSONDecodeError as e:
-            print(f"Error: Invalid JSON on line {line_num}: {e}", file=sys.stderr)
-            sys.exit(1)
-        except Exception as e:
-            print(f"Error processing line {line_num}: {e}", file=sys.stderr)
+def init_worker() -> None:
+    global worker_converter
+    worker_converter = DynamoDBJSONConverter()
+
+
+def convert_jsonl_lines_in_worker(lines: List[bytes], line_num: int, mode: str, pretty: bool,
+                                  without_item: bool) -> Tuple[bytes, Optional[str]]:
+    return convert_jsonl_lines(lines, line_num, worker_converter, mode, pretty, without_item)
+
+
+def convert_jsonl_parallel(input_stream: BinaryIO, mode: str, pretty: bool, without_item: bool,
+                           first_line: bytes, jobs: int) -> Iterator[Tuple[bytes, Optional[str]]]:
+    """Convert JSONL blocks in worker processes, yielding the results in input order"""
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker) as executor:
+        # Keep a few blocks per worker in flight instead of reading the whole input up front
+        pending = deque()
+        for lines, line_num in read_jsonl_blocks(input_stream, first_line):
+            pending.append(executor.submit(convert_jsonl_lines_in_worker,
+                                           lines, line_num, mode, pretty, without_item))
+            if len(pending) > 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def process_jsonl(input_stream: BinaryIO, output_stream: BinaryIO, converter: DynamoDBJSONConverter,
+                  mode: str, pretty: bool, without_item: bool, first_line: bytes = b"",
+                  jobs: int = 1) -> None:
+    """Process JSONL input in chunks of lines, using worker processes if jobs > 1"""
+    if jobs > 1:
+        results = convert_jsonl_parallel(input_stream, mode, pretty, without_item, first_line, jobs)
+    else:
+        results = (convert_jsonl_lines(lines, line_num, converter, mode, pretty, without_item)
+                   for lines, line_num in read_jsonl_blocks(input_stream, first_line))
+
+    for output, error in results:
+        # Also keep the lines converted before an error
+        output_stream.write(output)
+        if error is not None:
+            print(error, file=sys.stderr)
             sys.exit(1)
 
 
-def process_json(input_stream: TextIO, output_stream: TextIO, converter: DynamoDBJSONConverter,
-                 mode: str, pretty: bool, without_item: bool, first_line: str = "") -> None:
+def process_json(input_stream: BinaryIO, output_stream: BinaryIO, converter: DynamoDBJSONConverter,
+                 mode: str, pretty: bool, without_item: bool, first_line: bytes = b"") -> None:
     """Process single JSON object (non-JSONL)"""
     try:
         # Read entire input as single JSON
         content = first_line + input_stream.read()
-        input_data = json.loads(content)
+        input_data = json_loads(content)
 
         # Convert based on mode
         if mode == 'to-ddb':
@@ -228,10 +404,11 @@ def process_json(input_stream: TextIO, output_stream: TextIO, converter: DynamoD
             output_data = converter.from_dynamodb(input_data)
 
         # Output the result - safe_json_dumps handles non-serializable types
-        json_str = safe_json_dumps(output_data, pretty=pretty, ensure_ascii=False)
-        output_stream.write(json_str + '\n')
+        payload = safe_json_dumps(output_data, pretty=pretty, ensure_ascii=False)
+        output_stream.write(payload)
+        output_stream.write(b'\n')
 
-    except json.JSONDecodeError as e:
+    except JSON_DECODE_ERRORS as e:
         print(f"Error: Invalid JSON: {e}", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
@@ -239,22 +416,30 @@ def process_json(input_stream: TextIO, output_stream: TextIO, converter: DynamoD
         sys.exit(1)
 
 
-def detect_jsonl_from_content(input_stream: TextIO) -> tuple[bool, str]:
+def detect_jsonl_from_content(input_stream: BinaryIO) -> tuple[bool, bytes]:
     """
-    Detect if input is JSONL format by reading the first line.
-    Returns (is_jsonl, first_line) tuple.
+    Detect if input is JSONL format by parsing the first line.
+    The line is peeked from the read buffer if it fits there, so that it stays in the stream.
+    Returns (is_jsonl, first_line) tuple, first_line is what was consumed from the stream.
     """
-    first_line = input_stream.readline()
+    head = input_stream.peek(CHUNK_SIZE)
+    newline = head.find(b'\n')
+    if newline >= 0:
+        line = head[:newline]
+        first_line = b""
+    else:
+        # No complete line in the buffer, read it
+        line = first_line = input_stream.readline()
 
-    if not first_line.strip():
+    if not line.strip():
         return (False, first_line)
 
     # Try to parse the first line as JSON
     # If it parses successfully, it's JSONL; otherwise, it's a multi-line JSON
     try:
-        json.loads(first_line.strip())
+        json_loads(line.strip())
         return (True, first_line)
-    except json.JSONDecodeError:
+    except JSON_DECODE_ERRORS:
         return (False, first_line)
 
 
@@ -279,50 +464,52 @@ def main():
                         help='Pretty print output JSON')
     parser.add_argument('--without-item', action='store_true',
                         help='Omit top-level "Item" wrapper (only applies to to-ddb mode)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Number of worker processes for JSONL input (default: 1)')
 
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
 
     # Initialize converter
     converter = DynamoDBJSONConverter()
 
-    # Open input stream with buffering
+    # Open input stream with buffering, JSON is parsed directly from UTF-8 bytes
     if args.input_file:
         try:
-            # Use buffered reader for better performance
-            input_stream = io.BufferedReader(io.FileIO(args.input_file, 'r'))
-            input_stream = io.TextIOWrapper(input_stream, encoding='utf-8')
+            # Use buffered reader for better performance, large enough to peek at long lines
+            input_stream = io.BufferedReader(io.FileIO(args.input_file, 'r'), buffer_size=CHUNK_SIZE)
         except FileNotFoundError:
             print(f"Error: File '{args.input_file}' not found", file=sys.stderr)
             sys.exit(1)
     else:
-        input_stream = sys.stdin
+        input_stream = sys.stdin.buffer
 
-    # Open output stream with buffering
+    # Open output stream with buffering, JSON is written as UTF-8 bytes
     if args.output_file:
         try:
             # Use buffered writer for better performance
             output_stream = io.BufferedWriter(io.FileIO(args.output_file, 'w'))
-            output_stream = io.TextIOWrapper(output_stream, encoding='utf-8')
         except IOError as e:
             print(f"Error: Cannot write to '{args.output_file}': {e}", file=sys.stderr)
             sys.exit(1)
     else:
-        output_stream = sys.stdout
+        output_stream = sys.stdout.buffer
 
     try:
         # Detect if input is JSONL
         if args.input_file and args.input_file.endswith('.jsonl'):
             # Fast path: .jsonl extension means JSONL format
             is_jsonl = True
-            first_line = ""
+            first_line = b""
         else:
-            # Detect from content by reading first line
+            # Detect from content by looking at the first line
             is_jsonl, first_line = detect_jsonl_from_content(input_stream)
 
         # Process based on detected format
         if is_jsonl:
             process_jsonl(input_stream, output_stream, converter, args.mode,
-                         args.pretty, args.without_item, first_line)
+                         args.pretty, args.without_item, first_line, args.jobs)
         else:
             process_json(input_stream, output_stream, converter, args.mode,
                         args.pretty, args.without_item, first_line)
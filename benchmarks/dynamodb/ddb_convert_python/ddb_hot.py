@@ -0,0 +1,130 @@
+"""
+Hot path of ddb_convert: the walker that turns boto3's output into JSON types.
+
+Kept in a separate module so that it can be compiled with mypyc (see Makefile).
+When the compiled extension is present next to this file, Python imports it
+instead of this source, otherwise this pure Python version is used.
+"""
+
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Tuple
+
+from boto3.dynamodb.types import Binary  # type: ignore[import-untyped]
+
+try:
+    # SIMD accelerated base64 codec
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode  # type: ignore[assignment]
+
+
+def _serializable_bytes(obj: Any) -> str:
+    # Convert bytes to base64 string
+    return b64encode(obj).decode('ascii')
+
+
+def _serializable_binary(obj: Any) -> str:
+    return _serializable_bytes(bytes(obj))
+
+
+def _serializable_decimal(obj: Any) -> Any:
+    # Convert Decimal to int or float, preserving original intent: "4" -> int, "4.0" -> float
+    # Only a zero exponent is written without a decimal point or exponent
+    if obj.as_tuple().exponent == 0:
+        return int(obj)
+    else:
+        return float(obj)
+
+
+# Kinds of values: the items of containers are converted in place, scalars by a handler
+_DICT = 0
+_SEQUENCE = 1
+_SCALAR = 2
+
+# Kinds by exact type; sets and tuples become lists
+VALUE_KINDS: Dict[Any, int] = {
+    dict: _DICT,
+    list: _SEQUENCE,
+    tuple: _SEQUENCE,
+    set: _SEQUENCE,
+    bytes: _SCALAR,
+    Binary: _SCALAR,
+    Decimal: _SCALAR,
+}
+
+# Scalars that need converting, by exact type
+SCALAR_HANDLERS: Dict[Any, Callable[[Any], Any]] = {
+    bytes: _serializable_bytes,
+    Binary: _serializable_binary,
+    Decimal: _serializable_decimal,
+}
+
+# Types that are already serializable and are left in place
+AS_IS_TYPES = frozenset((str, int, float, bool, type(None)))
+
+# Handling of subclasses, checked in order with isinstance
+FALLBACK_KINDS: Tuple[Tuple[Any, int], ...] = (
+    (set, _SEQUENCE),
+    (dict, _DICT),
+    (list, _SEQUENCE),
+    (tuple, _SEQUENCE),
+    (Binary, _SCALAR),
+    (bytes, _SCALAR),
+    (Decimal, _SCALAR),
+)
+FALLBACK_SCALAR_HANDLERS: Tuple[Tuple[Any, Callable[[Any], Any]], ...] = (
+    (Binary, _serializable_binary),
+    (bytes, _serializable_bytes),
+    (Decimal, _serializable_decimal),
+)
+
+
+def _fallback_kind(obj: Any) -> int:
+    for base, kind in FALLBACK_KINDS:
+        if isinstance(obj, base):
+            return kind
+    return -1
+
+
+def _convert_scalar(obj: Any) -> Any:
+    handler = SCALAR_HANDLERS.get(type(obj))
+    if handler is not None:
+        return handler(obj)
+    for base, handler in FALLBACK_SCALAR_HANDLERS:
+        if isinstance(obj, base):
+            return handler(obj)
+    return obj
+
+
+def make_json_serializable(obj: Any) -> Any:
+    """
+    Convert Python objects to JSON-serializable types.
+    Handles boto3's output types: set, bytes, Decimal, Binary
+    Nested values are walked with an explicit stack instead of recursion,
+    so that deep items don't hit the recursion limit.
+    """
+    # Work items are (parent, key, value): the converted value is stored as parent[key]
+    root: List[Any] = [obj]
+    stack: List[Tuple[Any, Any, Any]] = [(root, 0, obj)]
+    while stack:
+        parent, key, value = stack.pop()
+        kind = VALUE_KINDS.get(type(value))
+        if kind is None:
+            kind = _fallback_kind(value)
+        if kind == _DICT:
+            # Copy first, then replace the items that need converting
+            result: Any = dict(value)
+            for k, v in result.items():
+                if type(v) not in AS_IS_TYPES:
+                    stack.append((result, k, v))
+        elif kind == _SEQUENCE:
+            result = list(value)
+            for i, v in enumerate(result):
+                if type(v) not in AS_IS_TYPES:
+                    stack.append((result, i, v))
+        elif kind == _SCALAR:
+            result = _convert_scalar(value)
+        else:
+            continue
+        parent[key] = result
+    return root[0]
@@ -3,19 +3,26 @@
 Tests for ddb_convert.py
 
 Tests conversion between DynamoDB JSON format and normal JSON format
-using fixtures from the ../fixture directory.
+using fixtures from the examples/dynamodb/fixture directory.
 """
 
+import contextlib
+import io
 import json
-import subprocess
 import sys
 import os
+import tempfile
+from functools import partial
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 # Path to the script
 SCRIPT_PATH = Path(__file__).parent / "ddb_convert.py"
-FIXTURE_DIR = Path(__file__).parent.parent / "fixture"
+FIXTURE_DIR = Path(__file__).resolve().parents[3] / "examples" / "dynamodb" / "fixture"
+
+# Import the converter once and run it in-process instead of starting an interpreter per test
+sys.path.insert(0, str(SCRIPT_PATH.parent))
+import ddb_convert  # noqa: E402
 
 
 class TestColors:
@@ -28,77 +35,123 @@ class TestColors:
     BOLD = '\033[1m'
 
 
-def run_conversion(mode: str, input_file: str, additional_args: List[str] = None) -> Tuple[str, str, int]:
+def run_conversion(mode: str, input_file: str, additional_args: List[str] = None) -> Tuple[bytes, str, int]:
+    """
+    Run ddb_convert.py in-process with given parameters: main() is called with
+    the command line set in sys.argv, and its stdout and stderr are captured
+
+    Returns: (stdout, stderr, returncode), stdout is left as bytes for json.loads
     """
-    Run ddb_convert.py with given parameters
+    argv = ["ddb_convert.py", mode, "-i", input_file] + (additional_args or [])
+
+    # The script writes the output to sys.stdout.buffer
+    output = io.BytesIO()
+    errors = io.StringIO()
+    returncode = 0
+
+    saved_argv = sys.argv
+    sys.argv = argv
+    try:
+        with contextlib.redirect_stdout(io.TextIOWrapper(output, write_through=True)), \
+                contextlib.redirect_stderr(errors):
+            try:
+                ddb_convert.main()
+            except SystemExit as e:
+                # Errors are reported on stderr and end with sys.exit
+                returncode = e.code
+            return output.getvalue(), errors.getvalue(), returncode
+    finally:
+        sys.argv = saved_argv
+
+
+def run_with_small_chunks(mode: str, input_file: str, additional_args: List[str] = None) -> Tuple[bytes, str, int]:
+    """Same as run_conversion, with JSONL read in small chunks so that the input is split into many blocks"""
+    saved_chunk_size = ddb_convert.CHUNK_SIZE
+    ddb_convert.CHUNK_SIZE = 1024
+    try:
+        return run_conversion(mode, input_file, additional_args)
+    finally:
+        ddb_convert.CHUNK_SIZE = saved_chunk_size
+
 
-    Returns: (stdout, stderr, returncode)
+def try_as_set(items) -> Optional[set]:
+    """
+    Convert to a set in a single pass, or return None if there are
+    unhashable items (dicts, lists, sets)
     """
-    cmd = [sys.executable, str(SCRIPT_PATH), mode, "-i", input_file]
-    if additional_args:
-        cmd.extend(additional_args)
+    try:
+        return set(items)
+    except TypeError:
+        return None
+
+
+DDB_TYPE_KEYS = frozenset(("S", "N", "BOOL", "NULL", "M", "L", "SS", "NS", "BS", "B"))
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    return result.stdout, result.stderr, result.returncode
+
+def ddb_type(obj: dict) -> Optional[str]:
+    """The type key if the dict is a DynamoDB typed value, otherwise None"""
+    if len(obj) == 1:
+        key = next(iter(obj))
+        if key in DDB_TYPE_KEYS:
+            return key
+    return None
+
+
+def compare_list_with_set(list_items, set_items, list_type, set_type, path, item_type) -> Optional[List[str]]:
+    """
+    Compare L with SS/NS as sets (order independent).
+    Returns None if L has items of other types, to compare them as usual.
+    """
+    if not all(isinstance(item, dict) and item_type in item and len(item) == 1 for item in list_items):
+        return None
+    # Convert L format to SS/NS format for comparison
+    if set(item[item_type] for item in list_items) != set(set_items):
+        return [f"{path}: {list_type} vs {set_type} content mismatch"]
+    return []
+
+
+def compare_base64_values(value1, value2, type1, type2, path) -> Optional[List[str]]:
+    """Compare S (String) with B (Binary), both represent the same base64 string value"""
+    if value1 == value2:
+        return []
+    return [f"{path}: {type1} vs {type2} value mismatch - {value1} vs {value2}"]
+
+
+# DynamoDB types compared as equivalent, by (type in obj1, type in obj2)
+EQUIVALENT_DDB_TYPES: Dict[Tuple[str, str], Callable[..., Optional[List[str]]]] = {
+    ("L", "SS"): partial(compare_list_with_set, item_type="S"),
+    ("L", "NS"): partial(compare_list_with_set, item_type="N"),
+    # Normal JSON has no binary, binary sets become lists of base64 strings
+    ("L", "BS"): partial(compare_list_with_set, item_type="S"),
+    ("S", "B"): compare_base64_values,
+    ("B", "S"): compare_base64_values,
+}
 
 
 def compare_json_objects(obj1, obj2, path="root") -> List[str]:
     """
     Compare two JSON objects and return list of differences.
     Handles sets vs lists as equivalent if they contain the same elements.
-    Handles DynamoDB L type vs SS/NS type as equivalent.
+    Handles DynamoDB L type vs SS/NS/BS type as equivalent.
     """
     differences = []
 
     # Special handling for DynamoDB types: L vs SS/NS, S vs B
     if isinstance(obj1, dict) and isinstance(obj2, dict):
-        # Check if obj1 has L and obj2 has SS
-        if "L" in obj1 and len(obj1) == 1 and "SS" in obj2 and len(obj2) == 1:
-            l_items = obj1["L"]
-            ss_items = obj2["SS"]
-            # Convert L format to SS format for comparison
-            if all(isinstance(item, dict) and "S" in item and len(item) == 1 for item in l_items):
-                l_as_ss = [item["S"] for item in l_items]
-                # Compare as sets (order independent)
-                if set(l_as_ss) != set(ss_items):
-                    differences.append(f"{path}: L vs SS content mismatch")
-                return differences
-
-        # Check if obj1 has L and obj2 has NS
-        if "L" in obj1 and len(obj1) == 1 and "NS" in obj2 and len(obj2) == 1:
-            l_items = obj1["L"]
-            ns_items = obj2["NS"]
-            # Convert L format to NS format for comparison
-            if all(isinstance(item, dict) and "N" in item and len(item) == 1 for item in l_items):
-                l_as_ns = [item["N"] for item in l_items]
-                # Compare as sets (order independent)
-                if set(l_as_ns) != set(ns_items):
-                    differences.append(f"{path}: L vs NS content mismatch")
-                return differences
-
-        # Check if obj1 has S (String) and obj2 has B (Binary) - treat as equivalent for base64
-        if "S" in obj1 and len(obj1) == 1 and "B" in obj2 and len(obj2) == 1:
-            # Both represent the same base64 string value
-            if obj1["S"] == obj2["B"]:
-                return differences  # They match
-            else:
-                differences.append(f"{path}: S vs B value mismatch - {obj1['S']} vs {obj2['B']}")
-                return differences
-
-        # Check if obj1 has B and obj2 has S - treat as equivalent for base64
-        if "B" in obj1 and len(obj1) == 1 and "S" in obj2 and len(obj2) == 1:
-            # Both represent the same base64 string value
-            if obj1["B"] == obj2["S"]:
-                return differences  # They match
-            else:
-                differences.append(f"{path}: B vs S value mismatch - {obj1['B']} vs {obj2['S']}")
-                return differences
+        type1 = ddb_type(obj1)
+        type2 = ddb_type(obj2)
+        if type1 is not None and type2 is not None:
+            compare_equivalent = EQUIVALENT_DDB_TYPES.get((type1, type2))
+            if compare_equivalent is not None:
+                equivalent_differences = compare_equivalent(obj1[type1], obj2[type2], type1, type2, path)
+                if equivalent_differences is not None:
+                    return equivalent_differences
 
     # Special handling for set vs list comparison
     if isinstance(obj1, (list, set)) and isinstance(obj2, (list, set)):
         # Convert both to sets for comparison
-        set1 = set(obj1) if not any(isinstance(x, (dict, list, set)) for x in obj1) else None
-        set2 = set(obj2) if not any(isinstance(x, (dict, list, set)) for x in obj2) else None
+        set1 = try_as_set(obj1)
+        set2 = try_as_set(obj2)
 
         if set1 is not None and set2 is not None:
             # Both are simple sets/lists - compare as sets
@@ -153,287 +206,201 @@ def compare_json_objects(obj1, obj2, path="root") -> List[str]:
     return differences
 
 
-def test_from_ddb_simple():
-    """Test from-ddb conversion with simple_item fixture"""
-    print(f"\n{TestColors.BLUE}Test: from-ddb with simple_item{TestColors.RESET}")
-
-    input_file = FIXTURE_DIR / "simple_item_dynamodb.json"
-    expected_file = FIXTURE_DIR / "simple_item_normal.json"
-
-    stdout, stderr, returncode = run_conversion("from-ddb", str(input_file))
-
-    if returncode != 0:
-        print(f"{TestColors.RED}✗ FAILED: Process returned error{TestColors.RESET}")
-        print(f"stderr: {stderr}")
-        return False
-
-    # Parse output and expected
-    result = json.loads(stdout)
-    with open(expected_file) as f:
-        expected = json.load(f)
+def json_objects_identical(obj1, obj2) -> bool:
+    """
+    Fast check that two JSON objects are equal, including the types of all values.
+    Walks the objects with a stack and stops at the first difference.
+    When it returns True, compare_json_objects doesn't find any differences either.
+    """
+    stack = [(obj1, obj2)]
+    while stack:
+        item1, item2 = stack.pop()
+        if item1 is item2:
+            continue
+        if type(item1) is not type(item2):
+            return False
+        if isinstance(item1, dict):
+            if item1.keys() != item2.keys():
+                return False
+            stack.extend((value, item2[key]) for key, value in item1.items())
+        elif isinstance(item1, list):
+            if len(item1) != len(item2):
+                return False
+            stack.extend(zip(item1, item2))
+        elif item1 != item2:
+            return False
+    return True
 
-    differences = compare_json_objects(result, expected)
 
-    if differences:
-        print(f"{TestColors.RED}✗ FAILED: Output doesn't match expected{TestColors.RESET}")
-        for diff in differences:
-            print(f"  {diff}")
-        return False
+def find_differences(obj1, obj2, path="root") -> List[str]:
+    """
+    Compare two JSON objects, with the fast check first.
+    Only collects the list of differences when the objects aren't identical.
+    """
+    if json_objects_identical(obj1, obj2):
+        return []
+    return compare_json_objects(obj1, obj2, path)
 
-    print(f"{TestColors.GREEN}✓ PASSED{TestColors.RESET}")
-    return True
 
+def format_differences(differences: List[str], limit: int = 10) -> str:
+    """The first differences, one per line, for an assertion message"""
+    lines = [f"  {diff}" for diff in differences[:limit]]
+    if len(differences) > limit:
+        lines.append(f"  ... and {len(differences) - limit} more differences")
+    return "\n".join(lines)
 
-def test_to_ddb_simple():
-    """Test to-ddb conversion with simple_item fixture"""
-    print(f"\n{TestColors.BLUE}Test: to-ddb with simple_item{TestColors.RESET}")
 
-    input_file = FIXTURE_DIR / "simple_item_normal.json"
-    expected_file = FIXTURE_DIR / "simple_item_dynamodb.json"
+def load_normal(name: str):
+    """Object of a normal JSON fixture, for the JSONL fixtures the array of their records"""
+    with open(FIXTURE_DIR / f"{name}-normal.json") as f:
+        return json.load(f)
 
-    stdout, stderr, returncode = run_conversion("to-ddb", str(input_file))
 
-    if returncode != 0:
-        print(f"{TestColors.RED}✗ FAILED: Process returned error{TestColors.RESET}")
-        print(f"stderr: {stderr}")
-        return False
+def load_jsonl(path) -> list:
+    """Objects of a JSONL file"""
+    with open(path, 'rb') as f:
+        return [json.loads(line) for line in f if line.strip()]
 
-    # Parse output - should have Item wrapper
-    result = json.loads(stdout)
 
-    # Load expected without Item wrapper and compare
-    with open(expected_file) as f:
-        expected_inner = json.load(f)
+def parse_jsonl_output(stdout: bytes) -> list:
+    """Objects of the JSONL output"""
+    return [json.loads(line) for line in stdout.split(b'\n') if line.strip()]
 
-    # Result should have Item wrapper
-    if "Item" not in result:
-        print(f"{TestColors.RED}✗ FAILED: Output missing 'Item' wrapper{TestColors.RESET}")
-        return False
 
-    differences = compare_json_objects(result["Item"], expected_inner)
+def check_conversion(mode: str, input_file, expected, additional_args: List[str] = None):
+    """Convert a JSON file and check that the output matches the expected object"""
+    stdout, stderr, returncode = run_conversion(mode, str(input_file), additional_args)
+    assert returncode == 0, f"Process returned error: {stderr}"
 
-    if differences:
-        print(f"{TestColors.RED}✗ FAILED: Output doesn't match expected{TestColors.RESET}")
-        for diff in differences:
-            print(f"  {diff}")
-        return False
+    differences = find_differences(json.loads(stdout), expected)
+    assert not differences, "Output doesn't match expected:\n" + format_differences(differences)
 
-    print(f"{TestColors.GREEN}✓ PASSED{TestColors.RESET}")
-    return True
 
+def check_jsonl_conversion(mode: str, input_file, expected_lines: list):
+    """Convert a JSONL file and check each output line against the expected objects"""
+    stdout, stderr, returncode = run_conversion(mode, str(input_file))
+    assert returncode == 0, f"Process returned error: {stderr}"
 
-def test_to_ddb_without_item():
-    """Test to-ddb conversion with --without-item flag"""
-    print(f"\n{TestColors.BLUE}Test: to-ddb with --without-item flag{TestColors.RESET}")
+    result_lines = parse_jsonl_output(stdout)
+    assert len(result_lines) == len(expected_lines), \
+        f"Number of lines mismatch - {len(result_lines)} vs {len(expected_lines)}"
 
-    input_file = FIXTURE_DIR / "simple_item_normal.json"
-    expected_file = FIXTURE_DIR / "simple_item_dynamodb.json"
+    for i, (result_obj, expected_obj) in enumerate(zip(result_lines, expected_lines)):
+        differences = find_differences(result_obj, expected_obj, f"line {i+1}")
+        assert not differences, f"Line {i+1} doesn't match:\n" + format_differences(differences, 5)
 
-    stdout, stderr, returncode = run_conversion("to-ddb", str(input_file), ["--without-item"])
 
-    if returncode != 0:
-        print(f"{TestColors.RED}✗ FAILED: Process returned error{TestColors.RESET}")
-        print(f"stderr: {stderr}")
-        return False
+def test_from_ddb_simple():
+    """Test from-ddb conversion with book fixture"""
+    check_conversion("from-ddb", FIXTURE_DIR / "book-dynamodb.json", load_normal("book"))
 
-    # Parse output - should NOT have Item wrapper
-    result = json.loads(stdout)
 
-    # Load expected
-    with open(expected_file) as f:
+def test_to_ddb_simple():
+    """Test to-ddb conversion with book fixture, the output has the Item wrapper"""
+    with open(FIXTURE_DIR / "book-dynamodb.json") as f:
         expected = json.load(f)
+    assert "Item" in expected
 
-    # Result should NOT have Item wrapper
-    if "Item" in result and len(result) == 1:
-        print(f"{TestColors.RED}✗ FAILED: Output has 'Item' wrapper when it shouldn't{TestColors.RESET}")
-        return False
+    check_conversion("to-ddb", FIXTURE_DIR / "book-normal.json", expected)
 
-    differences = compare_json_objects(result, expected)
 
-    if differences:
-        print(f"{TestColors.RED}✗ FAILED: Output doesn't match expected{TestColors.RESET}")
-        for diff in differences:
-            print(f"  {diff}")
-        return False
+def test_to_ddb_without_item():
+    """Test to-ddb conversion with --without-item flag"""
+    with open(FIXTURE_DIR / "book-dynamodb.json") as f:
+        expected = json.load(f)["Item"]
 
-    print(f"{TestColors.GREEN}✓ PASSED{TestColors.RESET}")
-    return True
+    check_conversion("to-ddb", FIXTURE_DIR / "book-normal.json", expected, ["--without-item"])
 
 
 def test_jsonl_from_ddb():
-    """Test from-ddb conversion with JSONL (yelp_business_mini)"""
-    print(f"\n{TestColors.BLUE}Test: from-ddb with JSONL (yelp_business_mini){TestColors.RESET}")
-
-    input_file = FIXTURE_DIR / "yelp_business_mini_dynamodb.jsonl"
-    expected_file = FIXTURE_DIR / "yelp_business_mini_normal.jsonl"
-
-    stdout, stderr, returncode = run_conversion("from-ddb", str(input_file))
-
-    if returncode != 0:
-        print(f"{TestColors.RED}✗ FAILED: Process returned error{TestColors.RESET}")
-        print(f"stderr: {stderr}")
-        return False
-
-    # Parse JSONL output
-    result_lines = [json.loads(line) for line in stdout.strip().split('\n') if line.strip()]
-
-    # Load expected JSONL
-    with open(expected_file) as f:
-        expected_lines = [json.loads(line) for line in f if line.strip()]
-
-    if len(result_lines) != len(expected_lines):
-        print(f"{TestColors.RED}✗ FAILED: Number of lines mismatch - {len(result_lines)} vs {len(expected_lines)}{TestColors.RESET}")
-        return False
-
-    # Compare each line
-    for i, (result_obj, expected_obj) in enumerate(zip(result_lines, expected_lines)):
-        differences = compare_json_objects(result_obj, expected_obj, f"line {i+1}")
-        if differences:
-            print(f"{TestColors.RED}✗ FAILED: Line {i+1} doesn't match{TestColors.RESET}")
-            for diff in differences[:5]:  # Show first 5 differences
-                print(f"  {diff}")
-            if len(differences) > 5:
-                print(f"  ... and {len(differences) - 5} more differences")
-            return False
-
-    print(f"{TestColors.GREEN}✓ PASSED{TestColors.RESET}")
-    return True
+    """Test from-ddb conversion with JSONL (users)"""
+    check_jsonl_conversion("from-ddb", FIXTURE_DIR / "users-dynamodb.jsonl", load_normal("users"))
 
 
 def test_jsonl_to_ddb():
-    """Test to-ddb conversion with JSONL (yelp_business_mini)"""
-    print(f"\n{TestColors.BLUE}Test: to-ddb with JSONL (yelp_business_mini){TestColors.RESET}")
+    """Test to-ddb conversion with JSONL (users)"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # The normal fixture is an array, written here one record per line
+        input_file = os.path.join(tmp_dir, "users-normal.jsonl")
+        with open(input_file, 'w') as f:
+            f.writelines(json.dumps(record) + "\n" for record in load_normal("users"))
 
-    input_file = FIXTURE_DIR / "yelp_business_mini_normal.jsonl"
-    expected_file = FIXTURE_DIR / "yelp_business_mini_dynamodb.jsonl"
-
-    stdout, stderr, returncode = run_conversion("to-ddb", str(input_file))
-
-    if returncode != 0:
-        print(f"{TestColors.RED}✗ FAILED: Process returned error{TestColors.RESET}")
-        print(f"stderr: {stderr}")
-        return False
-
-    # Parse JSONL output
-    result_lines = [json.loads(line) for line in stdout.strip().split('\n') if line.strip()]
-
-    # Load expected JSONL
-    with open(expected_file) as f:
-        expected_lines = [json.loads(line) for line in f if line.strip()]
-
-    if len(result_lines) != len(expected_lines):
-        print(f"{TestColors.RED}✗ FAILED: Number of lines mismatch - {len(result_lines)} vs {len(expected_lines)}{TestColors.RESET}")
-        return False
-
-    # Compare each line
-    for i, (result_obj, expected_obj) in enumerate(zip(result_lines, expected_lines)):
-        # Each result should have Item wrapper, each expected should too
-        differences = compare_json_objects(result_obj, expected_obj, f"line {i+1}")
-        if differences:
-            print(f"{TestColors.RED}✗ FAILED: Line {i+1} doesn't match{TestColors.RESET}")
-            for diff in differences[:5]:  # Show first 5 differences
-                print(f"  {diff}")
-            if len(differences) > 5:
-                print(f"  ... and {len(differences) - 5} more differences")
-            return False
-
-    print(f"{TestColors.GREEN}✓ PASSED{TestColors.RESET}")
-    return True
+        check_jsonl_conversion("to-ddb", input_file, load_jsonl(FIXTURE_DIR / "users-dynamodb.jsonl"))
 
 
 def test_complex_types_from_ddb():
-    """Test from-ddb conversion with complex_types fixture"""
-    print(f"\n{TestColors.BLUE}Test: from-ddb with complex_types{TestColors.RESET}")
-
-    input_file = FIXTURE_DIR / "complex_types_dynamodb.json"
-    expected_file = FIXTURE_DIR / "complex_types_normal.json"
+    """Test from-ddb conversion with all-types fixture"""
+    check_conversion("from-ddb", FIXTURE_DIR / "all-types-dynamodb.json", load_normal("all-types"))
 
-    stdout, stderr, returncode = run_conversion("from-ddb", str(input_file))
 
-    if returncode != 0:
-        print(f"{TestColors.RED}✗ FAILED: Process returned error{TestColors.RESET}")
-        print(f"stderr: {stderr}")
-        return False
-
-    # Parse output and expected
-    result = json.loads(stdout)
-    with open(expected_file) as f:
-        expected = json.load(f)
-
-    differences = compare_json_objects(result, expected)
-
-    if differences:
-        print(f"{TestColors.RED}✗ FAILED: Output doesn't match expected{TestColors.RESET}")
-        for diff in differences[:10]:  # Show first 10 differences
-            print(f"  {diff}")
-        if len(differences) > 10:
-            print(f"  ... and {len(differences) - 10} more differences")
-        return False
-
-    print(f"{TestColors.GREEN}✓ PASSED{TestColors.RESET}")
-    return True
+def test_complex_types_to_ddb():
+    """Test to-ddb conversion with all-types fixture"""
+    with open(FIXTURE_DIR / "all-types-dynamodb.json") as f:
+        expected = json.load(f)["Item"]
 
+    check_conversion("to-ddb", FIXTURE_DIR / "all-types-normal.json", expected, ["--without-item"])
 
-def test_complex_types_to_ddb():
-    """Test to-ddb conversion with complex_types fixture"""
-    print(f"\n{TestColors.BLUE}Test: to-ddb with complex_types{TestColors.RESET}")
 
-    input_file = FIXTURE_DIR / "complex_types_normal.json"
-    expected_file = FIXTURE_DIR / "complex_types_dynamodb.json"
+def test_pretty_output():
+    """Test --pretty flag produces valid JSON"""
+    stdout, stderr, returncode = run_conversion("to-ddb", str(FIXTURE_DIR / "book-normal.json"), ["--pretty"])
+    assert returncode == 0, f"Process returned error: {stderr}"
 
-    stdout, stderr, returncode = run_conversion("to-ddb", str(input_file), ["--without-item"])
+    # Check that output is valid JSON
+    json.loads(stdout)
 
-    if returncode != 0:
-        print(f"{TestColors.RED}✗ FAILED: Process returned error{TestColors.RESET}")
-        print(f"stderr: {stderr}")
-        return False
+    # Check that output contains indentation (pretty printed)
+    assert b'  ' in stdout, "Output doesn't appear to be pretty-printed"
 
-    # Parse output and expected
-    result = json.loads(stdout)
-    with open(expected_file) as f:
-        expected = json.load(f)
 
-    differences = compare_json_objects(result, expected)
+def write_jsonl_records(path: str, count: int) -> List[bytes]:
+    """Write JSONL input of many records, made from the users fixture. Returns the lines."""
+    users = load_normal("users")
+    lines = [(json.dumps(dict(users[i % len(users)], userId=f"user-{i:04}")) + "\n").encode()
+             for i in range(count)]
+    with open(path, 'wb') as f:
+        f.writelines(lines)
+    return lines
 
-    if differences:
-        print(f"{TestColors.RED}✗ FAILED: Output doesn't match expected{TestColors.RESET}")
-        for diff in differences[:10]:  # Show first 10 differences
-            print(f"  {diff}")
-        if len(differences) > 10:
-            print(f"  ... and {len(differences) - 10} more differences")
-        return False
 
-    print(f"{TestColors.GREEN}✓ PASSED{TestColors.RESET}")
-    return True
+def test_jsonl_parallel():
+    """Test that --jobs gives the same JSONL output as the sequential conversion"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_file = os.path.join(tmp_dir, "users.jsonl")
+        lines = write_jsonl_records(input_file, 200)
 
+        expected, stderr, returncode = run_with_small_chunks("to-ddb", input_file)
+        assert returncode == 0, f"Sequential conversion returned error: {stderr}"
+        stdout, stderr, returncode = run_with_small_chunks("to-ddb", input_file, ["--jobs", "2"])
 
-def test_pretty_output():
-    """Test --pretty flag produces valid JSON"""
-    print(f"\n{TestColors.BLUE}Test: --pretty flag{TestColors.RESET}")
+    assert returncode == 0, f"Process returned error: {stderr}"
+    assert stdout == expected, "Output differs from the sequential conversion"
 
-    input_file = FIXTURE_DIR / "simple_item_normal.json"
+    result_lines = parse_jsonl_output(stdout)
+    assert len(result_lines) == len(lines), f"Number of lines mismatch - {len(result_lines)} vs {len(lines)}"
+    assert result_lines[-1]["Item"]["userId"] == {"S": "user-0199"}, "The last line is not converted in order"
 
-    stdout, stderr, returncode = run_conversion("to-ddb", str(input_file), ["--pretty"])
 
-    if returncode != 0:
-        print(f"{TestColors.RED}✗ FAILED: Process returned error{TestColors.RESET}")
-        print(f"stderr: {stderr}")
-        return False
+def test_jsonl_parallel_error():
+    """Test that --jobs writes the lines before an invalid line and reports its line number"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_file = os.path.join(tmp_dir, "invalid.jsonl")
+        lines = write_jsonl_records(input_file, 200)
+        bad_line_num = len(lines) // 2 + 1
+        with open(input_file, 'wb') as f:
+            f.writelines(lines[:bad_line_num - 1] + [b'{"broken": \n'] + lines[bad_line_num - 1:])
 
-    # Check that output is valid JSON
-    try:
-        json.loads(stdout)
-    except json.JSONDecodeError as e:
-        print(f"{TestColors.RED}✗ FAILED: Output is not valid JSON: {e}{TestColors.RESET}")
-        return False
+        expected, _, _ = run_with_small_chunks("to-ddb", input_file)
+        stdout, stderr, returncode = run_with_small_chunks("to-ddb", input_file, ["--jobs", "2"])
 
-    # Check that output contains indentation (pretty printed)
-    if '  ' not in stdout:
-        print(f"{TestColors.RED}✗ FAILED: Output doesn't appear to be pretty-printed{TestColors.RESET}")
-        return False
+    assert returncode == 1, f"Expected return code 1, got {returncode}"
+    assert f"line {bad_line_num}:" in stderr, f"Error doesn't report line {bad_line_num}: {stderr}"
 
-    print(f"{TestColors.GREEN}✓ PASSED{TestColors.RESET}")
-    return True
+    # The lines before the invalid one are converted and written
+    written_lines = stdout.count(b'\n')
+    assert written_lines == bad_line_num - 1, \
+        f"Expected {bad_line_num - 1} lines before the error, got {written_lines}"
+    assert stdout == expected, "Output before the error doesn't match the sequential conversion"
 
 
 def main():
@@ -450,16 +417,24 @@ def main():
         test_complex_types_from_ddb,
         test_complex_types_to_ddb,
         test_pretty_output,
+        test_jsonl_parallel,
+        test_jsonl_parallel_error,
     ]
 
     results = []
     for test_func in tests:
+        print(f"\n{TestColors.BLUE}Test: {test_func.__doc__}{TestColors.RESET}")
         try:
-            passed = test_func()
-            results.append((test_func.__name__, passed))
+            test_func()
+        except AssertionError as e:
+            print(f"{TestColors.RED}✗ FAILED: {e}{TestColors.RESET}")
+            results.append((test_func.__name__, False))
         except Exception as e:
-            print(f"{TestColors.RED}✗ FAILED with exception: {e}{TestColors.RESET}")
+            print(f"{TestColors.RED}✗ FAILED with exception: {e!r}{TestColors.RESET}")
             results.append((test_func.__name__, False))
+        else:
+            print(f"{TestColors.GREEN}✓ PASSED{TestColors.RESET}")
+            results.append((test_func.__name__, True))
 
     # Print summary
     print("\n" + "=" * 60)
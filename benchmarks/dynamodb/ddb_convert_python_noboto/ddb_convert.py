@@ -2,11 +2,39 @@
 """Convert between DynamoDB JSON and normal JSON formats"""
 
 import argparse
+import functools
+import itertools
 import json
+import os
+import queue
 import sys
+import threading
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Union, TextIO
+from typing import Any, BinaryIO, Callable, Generator, List, Tuple
+
+# Compiled with mypyc when built, see Makefile
+from ddb_hot import from_dynamodb, to_dynamodb
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Number of parts (converted lines and newlines) collected before writing them
+WRITE_BATCH_SIZE = 2048
+
+# JSONL input is read in blocks of up to this many bytes on a background thread,
+# up to READ_AHEAD_BLOCKS blocks ahead of the conversion
+READ_BLOCK_SIZE = 1 << 20
+READ_AHEAD_BLOCKS = 4
+
+# A run of 19 digits may be an integer beyond 64 bits, which orjson would silently
+# turn into a float. Such input is parsed exactly by the stdlib instead. The runs are
+# found by mapping all digits to "0", which is faster than a regular expression.
+DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+LONG_DIGITS = b"0" * 19
 
 
 class Mode(Enum):
@@ -14,7 +42,79 @@ class Mode(Enum):
     TO_DDB = "to-ddb"
 
 
-def detect_jsonl_from_content(file: TextIO) -> Tuple[bool, str]:
+def json_loads(data: bytes) -> Any:
+    """
+    Parse JSON from UTF-8 bytes, with orjson if available.
+    Input with long digit runs, possibly integers beyond 64 bits, is parsed with the stdlib.
+    """
+    if orjson is not None and LONG_DIGITS not in data.translate(DIGITS_TO_ZERO):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # The stdlib accepts NaN and Infinity, or reports the error with its usual message
+            pass
+    return json.loads(data)
+
+
+def json_dumps(data: Any, pretty: bool) -> bytes:
+    """Serialize JSON to UTF-8 bytes, with orjson if available"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except orjson.JSONEncodeError:
+            # Integers beyond 64 bits, or strings with lone surrogates
+            pass
+    # Same layout as orjson. Non-ASCII characters are escaped, so that lone surrogates
+    # are written as \ud800 escapes and the output is still valid UTF-8.
+    try:
+        if pretty:
+            return json.dumps(data, indent=2).encode("ascii")
+        return json.dumps(data, separators=(",", ":")).encode("ascii")
+    except RecursionError:
+        return json_dumps_iterative(data, pretty)
+
+
+def json_dumps_iterative(data: Any, pretty: bool) -> bytes:
+    """
+    Same output as the stdlib in json_dumps, but walks nested dicts and lists with an
+    explicit stack instead of recursion. Slower, used for values nested deeper than the
+    recursion limit, such as deep to-ddb output, which has two levels per input level.
+    """
+    key_separator = ": " if pretty else ":"
+    parts: List[str] = []
+    # Work items are (value, nesting level), or (text, -1) for text written as it is
+    stack: List[Tuple[Any, int]] = [(data, 0)]
+    while stack:
+        value, level = stack.pop()
+        if level < 0:
+            parts.append(value)
+        elif isinstance(value, (dict, list)) and value:
+            # The items start on their own indented lines when pretty printing
+            inner = "\n" + "  " * (level + 1) if pretty else ""
+            outer = "\n" + "  " * level if pretty else ""
+            work: List[Tuple[Any, int]] = []
+            if isinstance(value, dict):
+                work.append(("{", -1))
+                for i, (k, v) in enumerate(value.items()):
+                    work.append((("," if i else "") + inner + json.dumps(k) + key_separator, -1))
+                    work.append((v, level + 1))
+                work.append((outer + "}", -1))
+            else:
+                work.append(("[", -1))
+                for i, v in enumerate(value):
+                    work.append((("," if i else "") + inner, -1))
+                    work.append((v, level + 1))
+                work.append((outer + "]", -1))
+            # Reversed, so that the items are popped in order
+            work.reverse()
+            stack.extend(work)
+        else:
+            # Scalars, and empty dicts and lists
+            parts.append(json.dumps(value))
+    return "".join(parts).encode("ascii")
+
+
+def detect_jsonl_from_content(file: BinaryIO) -> Tuple[bool, bytes]:
     """Detect if input is JSONL by trying to parse the first line"""
     first_line = file.readline()
 
@@ -22,199 +122,129 @@ def detect_jsonl_from_content(file: TextIO) -> Tuple[bool, str]:
         return False, first_line
 
     try:
-        json.loads(first_line.strip())
+        json_loads(first_line.strip())
         return True, first_line
     except json.JSONDecodeError:
         return False, first_line
 
 
-def unmarshall_value(value: Any) -> Any:
-    """Convert a DynamoDB typed value to a normal value"""
-    if not isinstance(value, dict):
-        raise ValueError("Expected DynamoDB type object")
+def read_blocks(read: Callable[[int], bytes], blocks: "queue.Queue[Any]", stop: threading.Event) -> None:
+    """Put blocks of the input on the queue, ending with an empty block"""
+    try:
+        while not stop.is_set():
+            block = read(READ_BLOCK_SIZE)
+            blocks.put(block)
+            if not block:
+                break
+    except Exception as e:
+        # Raised again by the consumer
+        blocks.put(e)
 
-    if len(value) != 1:
-        raise ValueError("DynamoDB type object must have exactly one key")
 
-    type_key, type_value = next(iter(value.items()))
+def read_lines(input_file: BinaryIO) -> Generator[bytes, None, None]:
+    """Iterate over the lines of the input, which is read on a background thread"""
+    blocks: "queue.Queue[Any]" = queue.Queue(maxsize=READ_AHEAD_BLOCKS)
 
-    if type_key == "S":
-        return type_value
-    elif type_key == "N":
-        if not isinstance(type_value, str):
-            raise ValueError("N type must be string")
-        # Try to parse as int first, then float
-        try:
-            if '.' in type_value or 'e' in type_value.lower():
-                return float(type_value)
-            else:
-                return int(type_value)
-        except ValueError:
-            raise ValueError(f"Invalid number format: {type_value}")
-    elif type_key == "BOOL":
-        return type_value
-    elif type_key == "NULL":
-        return None
-    elif type_key == "M":
-        if not isinstance(type_value, dict):
-            raise ValueError("M type must be object")
-        result = {}
-        for k, v in type_value.items():
-            result[k] = unmarshall_value(v)
-        return result
-    elif type_key == "L":
-        if not isinstance(type_value, list):
-            raise ValueError("L type must be array")
-        return [unmarshall_value(item) for item in type_value]
-    elif type_key == "SS":
-        return type_value
-    elif type_key == "NS":
-        if not isinstance(type_value, list):
-            raise ValueError("NS type must be array")
-        result = []
-        for item in type_value:
-            if not isinstance(item, str):
-                raise ValueError("NS items must be strings")
-            try:
-                if '.' in item or 'e' in item.lower():
-                    result.append(float(item))
-                else:
-                    result.append(int(item))
-            except ValueError:
-                raise ValueError(f"Invalid number format: {item}")
-        return result
-    elif type_key == "BS":
-        return type_value
-    elif type_key == "B":
-        return type_value
-    else:
-        raise ValueError(f"Unknown DynamoDB type: {type_key}")
-
-
-def from_dynamodb(value: Any) -> Any:
-    """Convert DynamoDB JSON format to normal JSON"""
-    if not isinstance(value, dict):
-        raise ValueError("Expected JSON object")
-
-    obj = value.copy()
-
-    # Check if it has "Item" wrapper
-    if len(obj) == 1 and "Item" in obj:
-        item_value = obj["Item"]
-        if not isinstance(item_value, dict):
-            raise ValueError("Expected Item to be an object")
-        obj = item_value
-
-    # Unmarshall DynamoDB format
-    result = {}
-    for key, val in obj.items():
-        result[key] = unmarshall_value(val)
-
-    return result
-
-
-def marshall_value(value: Any) -> Dict[str, Any]:
-    """Convert a normal value to DynamoDB typed value"""
-    if value is None:
-        return {"NULL": True}
-    elif isinstance(value, bool):
-        return {"BOOL": value}
-    elif isinstance(value, (int, float)):
-        return {"N": str(value)}
-    elif isinstance(value, str):
-        return {"S": value}
-    elif isinstance(value, list):
-        # Always use generic List type (L)
-        items = [marshall_value(item) for item in value]
-        return {"L": items}
-    elif isinstance(value, dict):
-        marshalled = {}
-        for k, v in value.items():
-            marshalled[k] = marshall_value(v)
-        return {"M": marshalled}
+    # The reads return what is available instead of waiting for a full block, so that
+    # lines from a pipe are converted as they arrive. The thread reads the file
+    # descriptor directly, after the data left in the buffer by the detection is taken
+    # here: a thread blocked in a read of the buffered input would hold its lock and
+    # make the interpreter abort at exit, while a thread blocked in os.read can be
+    # left behind when processing stops early.
+    read: Callable[[int], bytes]
+    try:
+        fd = input_file.fileno()
+    except OSError:
+        # In-memory streams don't block
+        read = getattr(input_file, "read1", input_file.read)
     else:
-        raise ValueError(f"Unsupported type: {type(value)}")
-
+        read1 = getattr(input_file, "read1", None)
+        if read1 is not None:
+            blocks.put(read1(READ_BLOCK_SIZE))
+        read = functools.partial(os.read, fd)
 
-def to_dynamodb(value: Any, wrap_item: bool) -> Any:
-    """Convert normal JSON to DynamoDB JSON format"""
-    if not isinstance(value, dict):
-        raise ValueError("Expected JSON object")
+    stop = threading.Event()
+    threading.Thread(target=read_blocks, args=(read, blocks, stop), daemon=True).start()
 
-    # Marshall to DynamoDB format
-    result = {}
-    for key, val in value.items():
-        result[key] = marshall_value(val)
-
-    if wrap_item:
-        return {"Item": result}
-    else:
-        return result
+    try:
+        # The incomplete last line of a block is carried over to the next one
+        tail = b""
+        while True:
+            block = blocks.get()
+            if isinstance(block, Exception):
+                raise block
+            if not block:
+                break
+            # Prepend the tail to the first line only instead of copying the whole block
+            lines = block.split(b"\n")
+            lines[0] = tail + lines[0]
+            tail = lines.pop()
+            yield from lines
+        if tail:
+            yield tail
+    finally:
+        stop.set()
 
 
 def process_jsonl(
-    input_file: TextIO,
-    output_file: TextIO,
+    input_file: BinaryIO,
+    output_file: BinaryIO,
     mode: Mode,
     pretty: bool,
     without_item: bool,
-    first_line: str
+    first_line: bytes
 ) -> None:
     """Process JSONL input (one JSON object per line)"""
-    # Process the first line that was already read during detection
-    line = first_line.strip()
-    if line:
-        try:
-            input_data = json.loads(line)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON on line 1: {e}")
-
-        if mode == Mode.FROM_DDB:
-            output_data = from_dynamodb(input_data)
-        else:
-            output_data = to_dynamodb(input_data, not without_item)
-
-        if pretty:
-            output_file.write(json.dumps(output_data, indent=2) + "\n")
-        else:
-            output_file.write(json.dumps(output_data) + "\n")
-
-    # Process remaining lines
-    for line_num, line in enumerate(input_file, start=2):
-        line = line.strip()
+    # The first line was already read during detection, if any
+    reader = read_lines(input_file)
+    lines = itertools.chain((first_line,), reader) if first_line else reader
 
-        if not line:
-            continue
+    # The conversion is chosen once, not per line
+    convert: Callable[[Any], Any]
+    if mode == Mode.FROM_DDB:
+        convert = from_dynamodb
+    else:
+        convert = functools.partial(to_dynamodb, wrap_item=not without_item)
 
-        try:
-            input_data = json.loads(line)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON on line {line_num}: {e}")
+    # Converted lines are collected and written in batches
+    batch: List[bytes] = []
+    append = batch.append
+    try:
+        for line_num, line in enumerate(lines, start=1):
+            # The parsers skip surrounding whitespace, so only blank lines are checked
+            # instead of stripping a copy of every line
+            if not line or line.isspace():
+                continue
 
-        if mode == Mode.FROM_DDB:
-            output_data = from_dynamodb(input_data)
-        else:
-            output_data = to_dynamodb(input_data, not without_item)
+            try:
+                input_data = json_loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_num}: {e}")
 
-        if pretty:
-            output_file.write(json.dumps(output_data, indent=2) + "\n")
-        else:
-            output_file.write(json.dumps(output_data) + "\n")
+            append(json_dumps(convert(input_data), pretty))
+            append(b"\n")
+            if len(batch) >= WRITE_BATCH_SIZE:
+                output_file.write(b"".join(batch))
+                batch.clear()
+    finally:
+        # Also write the lines converted before an error
+        output_file.write(b"".join(batch))
+        reader.close()
 
 
 def process_json(
-    input_file: TextIO,
-    output_file: TextIO,
+    input_file: BinaryIO,
+    output_file: BinaryIO,
     mode: Mode,
     pretty: bool,
     without_item: bool,
-    first_line: str
+    first_line: bytes
 ) -> None:
     """Process regular JSON input"""
     content = first_line + input_file.read()
 
     try:
-        input_data = json.loads(content)
+        input_data = json_loads(content)
     except json.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON: {e}")
 
@@ -223,10 +253,7 @@ def process_json(
     else:
         output_data = to_dynamodb(input_data, not without_item)
 
-    if pretty:
-        output_file.write(json.dumps(output_data, indent=2) + "\n")
-    else:
-        output_file.write(json.dumps(output_data) + "\n")
+    output_file.write(json_dumps(output_data, pretty) + b"\n")
 
 
 def main() -> None:
@@ -269,9 +296,9 @@ def main() -> None:
     try:
         # Open input
         if args.input:
-            input_file = open(args.input, 'r', buffering=65536)
+            input_file = open(args.input, 'rb', buffering=65536)
         else:
-            input_file = sys.stdin
+            input_file = sys.stdin.buffer
 
         try:
             # Detect if input is JSONL
@@ -279,7 +306,7 @@ def main() -> None:
                 # Check file extension first
                 if args.input.suffix == ".jsonl":
                     is_jsonl = True
-                    first_line = ""
+                    first_line = b""
                 else:
                     is_jsonl, first_line = detect_jsonl_from_content(input_file)
             else:
@@ -288,9 +315,9 @@ def main() -> None:
 
             # Open output
             if args.output:
-                output_file = open(args.output, 'w', buffering=65536)
+                output_file = open(args.output, 'wb', buffering=65536)
             else:
-                output_file = sys.stdout
+                output_file = sys.stdout.buffer
 
             try:
                 if is_jsonl:
@@ -0,0 +1,259 @@
+"""
+Hot path of ddb_convert: marshalling and unmarshalling of DynamoDB values.
+
+Kept in a separate module so that it can be compiled with mypyc (see Makefile).
+When the compiled extension is present next to this file, Python imports it
+instead of this source, otherwise this pure Python version is used.
+"""
+
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+
+def parse_number(text: str) -> Union[int, float]:
+    """Parse a DynamoDB number string"""
+    # A fraction means float. Otherwise try int, the common case, and only then
+    # float for exponents, without lowercasing a copy of the string
+    try:
+        if '.' in text:
+            return float(text)
+        try:
+            return int(text)
+        except ValueError:
+            if 'e' in text or 'E' in text:
+                return float(text)
+            raise
+    except ValueError:
+        raise ValueError(f"Invalid number format: {text}")
+
+
+def unmarshall_as_is(type_value: Any) -> Any:
+    return type_value
+
+
+def unmarshall_n(type_value: Any) -> Union[int, float]:
+    if not isinstance(type_value, str):
+        raise ValueError("N type must be string")
+    return parse_number(type_value)
+
+
+def unmarshall_null(type_value: Any) -> None:
+    return None
+
+
+def unmarshall_m(type_value: Any) -> Dict[str, Any]:
+    if not isinstance(type_value, dict):
+        raise ValueError("M type must be object")
+    return {k: unmarshall_value(v) for k, v in type_value.items()}
+
+
+def unmarshall_l(type_value: Any) -> List[Any]:
+    if not isinstance(type_value, list):
+        raise ValueError("L type must be array")
+    return [unmarshall_value(item) for item in type_value]
+
+
+def unmarshall_ns(type_value: Any) -> List[Union[int, float]]:
+    if not isinstance(type_value, list):
+        raise ValueError("NS type must be array")
+    result = []
+    for item in type_value:
+        if not isinstance(item, str):
+            raise ValueError("NS items must be strings")
+        result.append(parse_number(item))
+    return result
+
+
+# Unmarshall functions by DynamoDB type key
+UNMARSHALLERS: Dict[str, Callable[[Any], Any]] = {
+    "S": unmarshall_as_is,
+    "N": unmarshall_n,
+    "BOOL": unmarshall_as_is,
+    "NULL": unmarshall_null,
+    "M": unmarshall_m,
+    "L": unmarshall_l,
+    "SS": unmarshall_as_is,
+    "NS": unmarshall_ns,
+    "BS": unmarshall_as_is,
+    "B": unmarshall_as_is,
+}
+
+
+def unmarshall_value(value: Any) -> Any:
+    """Convert a DynamoDB typed value to a normal value"""
+    if not isinstance(value, dict):
+        raise ValueError("Expected DynamoDB type object")
+
+    # Unpacking checks that there is exactly one key and gets it in one step
+    try:
+        (type_key, type_value), = value.items()
+    except ValueError:
+        raise ValueError("DynamoDB type object must have exactly one key")
+
+    unmarshaller = UNMARSHALLERS.get(type_key)
+    if unmarshaller is None:
+        raise ValueError(f"Unknown DynamoDB type: {type_key}")
+    return unmarshaller(type_value)
+
+
+def unmarshall_value_iterative(value: Any) -> Any:
+    """
+    Same as unmarshall_value, but walks nested M and L values with an explicit stack
+    instead of recursion. Slower, used for values nested deeper than the recursion limit.
+    """
+    # Work items are (parent, key, value): the converted value is stored as parent[key]
+    root: List[Any] = [None]
+    stack: List[Tuple[Any, Any, Any]] = [(root, 0, value)]
+    while stack:
+        parent, key, value = stack.pop()
+        if not isinstance(value, dict):
+            raise ValueError("Expected DynamoDB type object")
+
+        try:
+            (type_key, type_value), = value.items()
+        except ValueError:
+            raise ValueError("DynamoDB type object must have exactly one key")
+
+        if type_key == "M":
+            if not isinstance(type_value, dict):
+                raise ValueError("M type must be object")
+            result: Any = dict(type_value)
+            children = [(result, k, v) for k, v in type_value.items()]
+        elif type_key == "L":
+            if not isinstance(type_value, list):
+                raise ValueError("L type must be array")
+            result = list(type_value)
+            children = [(result, i, v) for i, v in enumerate(type_value)]
+        else:
+            # Other types don't recurse
+            parent[key] = unmarshall_value(value)
+            continue
+
+        # Reversed, so that the items are converted and errors found in document order
+        children.reverse()
+        stack.extend(children)
+        parent[key] = result
+    return root[0]
+
+
+def from_dynamodb(value: Any) -> Any:
+    """Convert DynamoDB JSON format to normal JSON"""
+    if not isinstance(value, dict):
+        raise ValueError("Expected JSON object")
+
+    # Check if it has "Item" wrapper, the input is only read and not copied
+    obj = value
+    if len(value) == 1 and "Item" in value:
+        obj = value["Item"]
+        if not isinstance(obj, dict):
+            raise ValueError("Expected Item to be an object")
+
+    # Unmarshall DynamoDB format
+    try:
+        return {key: unmarshall_value(val) for key, val in obj.items()}
+    except RecursionError:
+        return {key: unmarshall_value_iterative(val) for key, val in obj.items()}
+
+
+def marshall_null(value: None) -> Dict[str, Any]:
+    return {"NULL": True}
+
+
+def marshall_bool(value: bool) -> Dict[str, Any]:
+    return {"BOOL": value}
+
+
+def marshall_number(value: Union[int, float]) -> Dict[str, Any]:
+    return {"N": str(value)}
+
+
+def marshall_string(value: str) -> Dict[str, Any]:
+    return {"S": value}
+
+
+def marshall_list(value: List[Any]) -> Dict[str, Any]:
+    # Always use generic List type (L)
+    return {"L": [marshall_value(item) for item in value]}
+
+
+def marshall_dict(value: Dict[str, Any]) -> Dict[str, Any]:
+    return {"M": {k: marshall_value(v) for k, v in value.items()}}
+
+
+# Marshall functions by exact Python type, bool is its own entry and not treated as int
+MARSHALLERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {
+    type(None): marshall_null,
+    bool: marshall_bool,
+    int: marshall_number,
+    float: marshall_number,
+    str: marshall_string,
+    list: marshall_list,
+    dict: marshall_dict,
+}
+
+
+def marshall_value(value: Any) -> Dict[str, Any]:
+    """Convert a normal value to DynamoDB typed value"""
+    marshaller = MARSHALLERS.get(type(value))
+    if marshaller is not None:
+        return marshaller(value)
+
+    # Subclasses of the JSON types
+    if isinstance(value, bool):
+        return marshall_bool(value)
+    elif isinstance(value, (int, float)):
+        return marshall_number(value)
+    elif isinstance(value, str):
+        return marshall_string(value)
+    elif isinstance(value, list):
+        return marshall_list(value)
+    elif isinstance(value, dict):
+        return marshall_dict(value)
+    else:
+        raise ValueError(f"Unsupported type: {type(value)}")
+
+
+def marshall_value_iterative(value: Any) -> Dict[str, Any]:
+    """
+    Same as marshall_value, but walks nested dicts and lists with an explicit stack
+    instead of recursion. Slower, used for values nested deeper than the recursion limit.
+    """
+    # Work items are (parent, key, value): the converted value is stored as parent[key]
+    root: List[Any] = [None]
+    stack: List[Tuple[Any, Any, Any]] = [(root, 0, value)]
+    while stack:
+        parent, key, value = stack.pop()
+        if isinstance(value, dict):
+            marshalled: Any = dict(value)
+            children = [(marshalled, k, v) for k, v in value.items()]
+            result = {"M": marshalled}
+        elif isinstance(value, list):
+            marshalled = list(value)
+            children = [(marshalled, i, v) for i, v in enumerate(value)]
+            result = {"L": marshalled}
+        else:
+            # Other types don't recurse
+            parent[key] = marshall_value(value)
+            continue
+
+        # Reversed, so that the items are converted and errors found in document order
+        children.reverse()
+        stack.extend(children)
+        parent[key] = result
+    return root[0]
+
+
+def to_dynamodb(value: Any, wrap_item: bool) -> Any:
+    """Convert normal JSON to DynamoDB JSON format"""
+    if not isinstance(value, dict):
+        raise ValueError("Expected JSON object")
+
+    # Marshall to DynamoDB format
+    try:
+        result = {key: marshall_value(val) for key, val in value.items()}
+    except RecursionError:
+        result = {key: marshall_value_iterative(val) for key, val in value.items()}
+
+    if wrap_item:
+        return {"Item": result}
+    else:
+        return result
@@ -4,6 +4,7 @@ Generate JSON with file sizes.
 Takes a list of JSON files and outputs their sizes in bytes.
 """
 
+import json
 import os
 import sys
 
@@ -14,9 +15,7 @@ def simplify_filename(filename):
     yelp_academic_dataset_business.json -> business.json
     other.json -> other.json
     """
-    if filename.startswith('yelp_academic_dataset_'):
-        return filename.replace('yelp_academic_dataset_', '')
-    return filename
+    return filename.removeprefix('yelp_academic_dataset_')
 
 
 def get_file_sizes(file_list):
@@ -24,11 +23,13 @@ def get_file_sizes(file_list):
     results = []
 
     for filepath in file_list:
-        if not os.path.exists(filepath):
+        # A single stat call instead of checking existence and then getting the size
+        try:
+            size = os.stat(filepath).st_size
+        except OSError:
             print(f"Warning: File not found: {filepath}", file=sys.stderr)
             continue
 
-        size = os.path.getsize(filepath)
         filename = os.path.basename(filepath)
         simplified_name = simplify_filename(filename)
 
@@ -48,9 +49,8 @@ def main():
     file_list = sys.argv[1:]
     results = get_file_sizes(file_list)
 
-    # Print JSON records
-    for record in results:
-        print('{ "file": "' + record['file'] + '", "size": ' + str(record['size']) + ' }')
+    # Print JSON records, escaped by json.dumps, with a single write
+    sys.stdout.write(''.join(json.dumps(record) + '\n' for record in results))
 
 
 if __name__ == '__main__':
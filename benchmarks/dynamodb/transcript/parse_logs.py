@@ -4,10 +4,31 @@ Parse GNU time output from benchmark logs and convert to JSON format.
 Each benchmark result becomes a two-line JSON object.
 """
 
+import json
 import re
 import sys
 
 
+# Patterns are compiled once, not looked up in the re cache for every line
+USER_RE = re.compile(r'(\d+\.\d+)user')
+SYSTEM_RE = re.compile(r'(\d+\.\d+)system')
+ELAPSED_RE = re.compile(r'(\d+):(\d+\.\d+)elapsed')
+CPU_RE = re.compile(r'(\d+)%CPU')
+MAXRESIDENT_RE = re.compile(r'(\d+)maxresident')
+INPUTS_RE = re.compile(r'(\d+)inputs')
+OUTPUTS_RE = re.compile(r'(\d+)outputs')
+MAJOR_RE = re.compile(r'(\d+)major')
+MINOR_RE = re.compile(r'(\d+)minor')
+SWAPS_RE = re.compile(r'(\d+)swaps')
+INPUT_FILE_RE = re.compile(r'-i\s+(\S+)')
+
+# Whole lines in the usual GNU time format, parsed in one scan
+TIME_LINE_RE = re.compile(
+    r'(\d+\.\d+)user (\d+\.\d+)system (\d+):(\d+\.\d+)elapsed (\d+)%CPU '
+    r'\(\d+avgtext\+\d+avgdata (\d+)maxresident\)k')
+IO_LINE_RE = re.compile(r'(\d+)inputs\+(\d+)outputs \((\d+)major\+(\d+)minor\)pagefaults (\d+)swaps')
+
+
 def simplify_filename(full_path):
     """Extract and simplify filename from path.
 
@@ -27,32 +48,44 @@ def parse_time_line(line):
 
     Returns dict with parsed fields.
     """
+    m = TIME_LINE_RE.search(line)
+    if m:
+        user, system, minutes, seconds, cpu_percent, maxresident_kb = m.groups()
+        return {
+            'user': float(user),
+            'system': float(system),
+            'elapsed': int(minutes) * 60 + float(seconds),
+            'cpu_percent': int(cpu_percent),
+            'maxresident_kb': int(maxresident_kb),
+        }
+
+    # Otherwise parse the fields that are present one by one
     result = {}
 
     # Parse user time
-    m = re.search(r'(\d+\.\d+)user', line)
+    m = USER_RE.search(line)
     if m:
         result['user'] = float(m.group(1))
 
     # Parse system time
-    m = re.search(r'(\d+\.\d+)system', line)
+    m = SYSTEM_RE.search(line)
     if m:
         result['system'] = float(m.group(1))
 
     # Parse elapsed time (format: M:SS.ss or H:MM:SS.ss)
-    m = re.search(r'(\d+):(\d+\.\d+)elapsed', line)
+    m = ELAPSED_RE.search(line)
     if m:
         minutes = int(m.group(1))
         seconds = float(m.group(2))
         result['elapsed'] = minutes * 60 + seconds
 
     # Parse CPU percentage
-    m = re.search(r'(\d+)%CPU', line)
+    m = CPU_RE.search(line)
     if m:
         result['cpu_percent'] = int(m.group(1))
 
     # Parse maxresident memory (in KB)
-    m = re.search(r'(\d+)maxresident', line)
+    m = MAXRESIDENT_RE.search(line)
     if m:
         result['maxresident_kb'] = int(m.group(1))
 
@@ -66,30 +99,42 @@ def parse_io_line(line):
 
     Returns dict with parsed fields.
     """
+    m = IO_LINE_RE.search(line)
+    if m:
+        inputs, outputs, major, minor, swaps = m.groups()
+        return {
+            'inputs': int(inputs),
+            'outputs': int(outputs),
+            'major_pagefaults': int(major),
+            'minor_pagefaults': int(minor),
+            'swaps': int(swaps),
+        }
+
+    # Otherwise parse the fields that are present one by one
     result = {}
 
     # Parse inputs
-    m = re.search(r'(\d+)inputs', line)
+    m = INPUTS_RE.search(line)
     if m:
         result['inputs'] = int(m.group(1))
 
     # Parse outputs
-    m = re.search(r'(\d+)outputs', line)
+    m = OUTPUTS_RE.search(line)
     if m:
         result['outputs'] = int(m.group(1))
 
     # Parse major page faults
-    m = re.search(r'(\d+)major', line)
+    m = MAJOR_RE.search(line)
     if m:
         result['major_pagefaults'] = int(m.group(1))
 
     # Parse minor page faults
-    m = re.search(r'(\d+)minor', line)
+    m = MINOR_RE.search(line)
     if m:
         result['minor_pagefaults'] = int(m.group(1))
 
     # Parse swaps
-    m = re.search(r'(\d+)swaps', line)
+    m = SWAPS_RE.search(line)
     if m:
         result['swaps'] = int(m.group(1))
 
@@ -106,17 +151,18 @@ def parse_command_line(line):
     mode = None
     input_file = None
 
-    # Extract mode (to-ddb or from-ddb)
-    # Check from-ddb first since it contains "to-ddb" as substring
-    if 'from-ddb' in line:
+    # Extract mode (to-ddb or from-ddb) from the first "-ddb" in the line,
+    # which comes before the input and output paths
+    idx = line.find('-ddb')
+    if idx >= 4 and line.startswith('from', idx - 4):
         mode = 'from-ddb'
-    elif 'to-ddb' in line:
+    elif idx >= 2 and line.startswith('to', idx - 2):
         mode = 'to-ddb'
     else:
         raise ValueError(f"Mode not found in command line: {line}")
 
     # Extract input file after -i flag
-    m = re.search(r'-i\s+(\S+)', line)
+    m = INPUT_FILE_RE.search(line)
     if m:
         input_file = simplify_filename(m.group(1))
     else:
@@ -125,28 +171,47 @@ def parse_command_line(line):
     return mode, input_file
 
 
-def parse_log(log_file, tool_name):
-    """Parse a log file and output JSON objects."""
-    with open(log_file, 'r') as f:
-        lines = [line.strip() for line in f if line.strip()]
+def non_empty_lines(f):
+    """Yield the stripped non-empty lines of a file, reading it lazily."""
+    for line in f:
+        line = line.strip()
+        if line:
+            yield line
+
 
-    i = 0
-    while i < len(lines):
-        line = lines[i]
+def format_fields(result, keys):
+    """Format the given numeric fields of a result that are present as JSON members."""
+    return ', '.join([f'"{key}": {result[key]}' for key in keys if key in result])
 
-        # Look for "time" command lines
-        if line.startswith('time '):
-            mode, input_file = parse_command_line(line)
 
-            # Next line should be the time output
-            if i + 1 < len(lines):
-                time_data = parse_time_line(lines[i + 1])
+def print_result(result):
+    """Print a benchmark result as four-line JSON, with a single write."""
+    # Only the strings of the id need escaping, numbers are formatted as in JSON
+    result_id = result['id']
+    sys.stdout.write(
+        f'{{ "id": {{ "tool": {json.dumps(result_id["tool"])}, "file": {json.dumps(result_id["file"])}, '
+        f'"mode": {json.dumps(result_id["mode"])} }},\n'
+        # Line 2: user, system, elapsed, cpu_percent
+        '    ' + format_fields(result, ['user', 'system', 'elapsed', 'cpu_percent']) + ',\n'
+        # Line 3: maxresident_kb, inputs, outputs
+        '    ' + format_fields(result, ['maxresident_kb', 'inputs', 'outputs']) + ',\n'
+        # Line 4: major_pagefaults, minor_pagefaults, swaps
+        '    ' + format_fields(result, ['major_pagefaults', 'minor_pagefaults', 'swaps']) + ' }\n'
+    )
 
-                # Line after that should be I/O data
-                if i + 2 < len(lines):
-                    io_data = parse_io_line(lines[i + 2])
 
-                    # Combine all data
+def parse_log(log_file, tool_name):
+    """Parse a log file and output JSON objects."""
+    # The log is streamed: a "time" command line is expected to be followed by
+    # the time output, then by the I/O data. Both are None while not expected.
+    command = None
+    time_data = None
+    with open(log_file, 'r') as f:
+        for line in non_empty_lines(f):
+            if time_data is not None:
+                # Line after the time output should be I/O data
+                if 'pagefaults' in line:
+                    mode, input_file = command
                     result = {
                         'id': {
                             'tool': tool_name,
@@ -155,36 +220,23 @@ def parse_log(log_file, tool_name):
                         }
                     }
                     result.update(time_data)
-                    result.update(io_data)
-
-                    # Print as four-line JSON
-                    print('{ "id": { "tool": "' + result['id']['tool'] + '", "file": "' + result['id']['file'] + '", "mode": "' + result['id']['mode'] + '" },')
-
-                    # Line 2: user, system, elapsed, cpu_percent
-                    line2_fields = []
-                    for key in ['user', 'system', 'elapsed', 'cpu_percent']:
-                        if key in result:
-                            line2_fields.append(f'"{key}": {result[key]}')
-                    print('    ' + ', '.join(line2_fields) + ',')
-
-                    # Line 3: maxresident_kb, inputs, outputs
-                    line3_fields = []
-                    for key in ['maxresident_kb', 'inputs', 'outputs']:
-                        if key in result:
-                            line3_fields.append(f'"{key}": {result[key]}')
-                    print('    ' + ', '.join(line3_fields) + ',')
-
-                    # Line 4: major_pagefaults, minor_pagefaults, swaps
-                    line4_fields = []
-                    for key in ['major_pagefaults', 'minor_pagefaults', 'swaps']:
-                        if key in result:
-                            line4_fields.append(f'"{key}": {result[key]}')
-                    print('    ' + ', '.join(line4_fields) + ' }')
-
-                    i += 3
+                    result.update(parse_io_line(line))
+                    print_result(result)
+                    command = time_data = None
+                    continue
+                command = time_data = None
+
+            elif command is not None:
+                # Next line should be the time output, a cheap substring check skips
+                # the regexes for lines that are something else
+                if 'elapsed' in line:
+                    time_data = parse_time_line(line)
                     continue
+                command = None
 
-        i += 1
+            # Look for "time" command lines
+            if line.startswith('time '):
+                command = parse_command_line(line)
 
 
 if __name__ == '__main__':
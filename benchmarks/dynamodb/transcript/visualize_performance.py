@@ -6,13 +6,22 @@ Creates two charts:
 1. Time to process 1 GB of JSON (lower is better)
 2. JSON bytes processed per second (higher is better)
 
-Prints mean and standard deviation to stdout.
+Prints mean and standard deviation to stdout. With --no-plot, only the
+statistics are printed and matplotlib is not loaded.
 """
 
+import argparse
 import json
+import re
 import sys
+from collections import defaultdict
 import numpy as np
-import matplotlib.pyplot as plt
+
+# Shared by all loads, the decoder keeps no state between calls
+DECODER = json.JSONDecoder()
+
+# Skips the whitespace between objects
+NON_WHITESPACE_RE = re.compile(r'\S')
 
 
 def load_json_objects(filename):
@@ -26,21 +35,20 @@ def load_json_objects(filename):
     with open(filename, 'r') as f:
         content = f.read()
 
-    decoder = json.JSONDecoder()
+    decoder = DECODER
     idx = 0
 
-    while idx < len(content):
+    while True:
         # Skip whitespace
-        while idx < len(content) and content[idx].isspace():
-            idx += 1
-
-        if idx >= len(content):
+        m = NON_WHITESPACE_RE.search(content, idx)
+        if m is None:
             break
+        idx = m.start()
 
         try:
-            obj, offset = decoder.raw_decode(content[idx:])
+            # Decoding at an offset avoids copying the rest of the content
+            obj, idx = decoder.raw_decode(content, idx)
             objects.append(obj)
-            idx += offset
         except json.JSONDecodeError as e:
             print(f"Error parsing JSON in file '{filename}' at position {idx}: {e}", file=sys.stderr)
             print(f"Context: {content[idx:idx+100]}...", file=sys.stderr)
@@ -68,14 +76,15 @@ def calculate_metrics(stats, file_sizes):
 
     Only includes files >= 1 GB to reduce variance from small files.
     """
-    tool_data = {}
     MIN_FILE_SIZE = 1024 ** 3  # 1 GB
 
+    # Columns of the records to include, the metrics are computed on arrays
+    keys = []
+    cpu_times = []
+    sizes = []
+
     for record in stats:
-        tool = record['id']['tool']
-        mode = record['id']['mode']
         file_name = record['id']['file']
-        cpu_time = record['user'] + record['system']
 
         if file_name not in file_sizes:
             continue
@@ -86,55 +95,87 @@ def calculate_metrics(stats, file_sizes):
         if file_size < MIN_FILE_SIZE:
             continue
 
-        # Calculate metrics
-        gb_size = file_size / (1024 ** 3)
-        time_per_gb = cpu_time / gb_size
-        bytes_per_sec = file_size / cpu_time
-
         # Separate by tool and mode
-        key = f"{tool} ({mode})"
+        keys.append((record['id']['tool'], record['id']['mode']))
+        cpu_times.append(record['user'] + record['system'])
+        sizes.append(file_size)
+
+    # Calculate metrics
+    cpu_times = np.array(cpu_times, dtype=float)
+    sizes = np.array(sizes, dtype=float)
+    gb_sizes = sizes / (1024 ** 3)
+    time_per_gb = cpu_times / gb_sizes
+    bytes_per_sec = sizes / cpu_times
 
-        if key not in tool_data:
-            tool_data[key] = {
-                'time_per_gb': [],
-                'bytes_per_sec': []
-            }
+    # Rows of each (tool, mode)
+    groups = defaultdict(list)
+    for row, key in enumerate(keys):
+        groups[key].append(row)
 
-        tool_data[key]['time_per_gb'].append(time_per_gb)
-        tool_data[key]['bytes_per_sec'].append(bytes_per_sec)
+    tool_data = {}
+    for key, rows in groups.items():
+        tool_data[key] = {
+            'time_per_gb': time_per_gb[rows],
+            'bytes_per_sec': bytes_per_sec[rows]
+        }
 
     return tool_data
 
 
-def print_statistics(tool_data):
+def summarize(values):
+    """Mean, standard deviation, min and max of an array of values."""
+    return {
+        'mean': np.mean(values),
+        'std': np.std(values),
+        'min': np.min(values),
+        'max': np.max(values)
+    }
+
+
+def summarize_metrics(tool_data):
+    """Summarize the metrics of each tool once, for both the statistics and the charts."""
+    summaries = {}
+    for key, data in tool_data.items():
+        summaries[key] = {
+            'time_per_gb': summarize(np.asarray(data['time_per_gb'])),
+            'throughput_mb': summarize(np.asarray(data['bytes_per_sec']) / (1024 ** 2))
+        }
+    return summaries
+
+
+def print_statistics(summaries):
     """Print mean and standard deviation for each tool."""
     print("Performance Statistics")
     print("=" * 80)
     print()
 
-    for tool in sorted(tool_data.keys()):
-        print(f"Tool: {tool}")
+    for tool, mode in sorted(summaries.keys()):
+        print(f"Tool: {tool} ({mode})")
         print("-" * 40)
 
-        time_data = np.array(tool_data[tool]['time_per_gb'])
-        throughput_data = np.array(tool_data[tool]['bytes_per_sec'])
-
+        time_summary = summaries[(tool, mode)]['time_per_gb']
         print(f"  Time per GB (seconds):")
-        print(f"    Mean: {np.mean(time_data):.2f} ± {np.std(time_data):.2f}")
-        print(f"    Min:  {np.min(time_data):.2f}")
-        print(f"    Max:  {np.max(time_data):.2f}")
+        print(f"    Mean: {time_summary['mean']:.2f} ± {time_summary['std']:.2f}")
+        print(f"    Min:  {time_summary['min']:.2f}")
+        print(f"    Max:  {time_summary['max']:.2f}")
         print()
 
+        throughput_summary = summaries[(tool, mode)]['throughput_mb']
         print(f"  Throughput (MB/s):")
-        throughput_mb = throughput_data / (1024 ** 2)
-        print(f"    Mean: {np.mean(throughput_mb):.2f} ± {np.std(throughput_mb):.2f}")
-        print(f"    Min:  {np.min(throughput_mb):.2f}")
-        print(f"    Max:  {np.max(throughput_mb):.2f}")
+        print(f"    Mean: {throughput_summary['mean']:.2f} ± {throughput_summary['std']:.2f}")
+        print(f"    Min:  {throughput_summary['min']:.2f}")
+        print(f"    Max:  {throughput_summary['max']:.2f}")
         print()
 
 
-def create_visualizations(tool_data):
+def create_visualizations(summaries):
     """Create performance visualization charts."""
+    # Imported only when needed, loading matplotlib takes a while.
+    # The charts are saved to a file, so no GUI backend is needed.
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
     # Map technical names to human-friendly names
     name_map = {
         'scan-json': 'scan_json',
@@ -145,23 +186,15 @@ def create_visualizations(tool_data):
 
     # Rename tools to human-friendly names
     renamed_data = {}
-    for key, value in tool_data.items():
-        # Parse "tool (mode)" format
-        parts = key.split(' (')
-        if len(parts) == 2:
-            tool = parts[0]
-            mode = parts[1].rstrip(')')
-            friendly_name = name_map.get(tool, tool)
-            new_key = f"{friendly_name} ({mode})"
-        else:
-            new_key = key
-        renamed_data[new_key] = value
+    for (tool, mode), value in summaries.items():
+        friendly_name = name_map.get(tool, tool)
+        renamed_data[f"{friendly_name} ({mode})"] = value
 
     tools = sorted(renamed_data.keys())
 
-    # Calculate means for each metric
-    time_means = [np.mean(renamed_data[tool]['time_per_gb']) for tool in tools]
-    throughput_means = [np.mean(renamed_data[tool]['bytes_per_sec']) / (1024 ** 2) for tool in tools]
+    # Means of each metric
+    time_means = [renamed_data[tool]['time_per_gb']['mean'] for tool in tools]
+    throughput_means = [renamed_data[tool]['throughput_mb']['mean'] for tool in tools]
 
     # Create figure with two subplots
     # Size in inches: 640x480 pixels at 100 DPI = 6.4x4.8 inches
@@ -197,6 +230,11 @@ def create_visualizations(tool_data):
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Visualize performance of different tools for JSON processing')
+    parser.add_argument('--no-plot', action='store_true',
+                        help='Only print the statistics, without creating the charts')
+    args = parser.parse_args()
+
     stats_file = 'stats.json'
     file_sizes_file = 'file_stats.json'
 
@@ -206,12 +244,14 @@ def main():
 
     # Calculate metrics
     tool_data = calculate_metrics(stats, file_sizes)
+    summaries = summarize_metrics(tool_data)
 
     # Print statistics to stdout
-    print_statistics(tool_data)
+    print_statistics(summaries)
 
     # Create visualizations
-    create_visualizations(tool_data)
+    if not args.no_plot:
+        create_visualizations(summaries)
 
 
 if __name__ == '__main__':
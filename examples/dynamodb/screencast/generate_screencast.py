@@ -5,6 +5,7 @@ Left pane: Docker command reading from pipe
 Right pane: pv command writing to pipe
 """
 
+import codecs
 import json
 import time
 import subprocess
@@ -14,6 +15,19 @@ import sys
 import random
 from pathlib import Path
 
+try:
+    # Faster serialization of the events
+    import orjson
+except ImportError:
+    orjson = None
+
+# Cursor movement by line and column, both 1-based as in the terminal
+CURSOR_TO = [[f"\x1b[{line};{col}H" for col in range(81)] for line in range(25)]
+
+# Clear the pane lines, then draw the vertical separator at column 40
+PANES_FRAME = ("".join(CURSOR_TO[i][1] + "\x1b[K" for i in range(1, 23))
+               + "".join(CURSOR_TO[i][40] + "│" for i in range(1, 23)))
+
 class ScreencastGenerator:
     CHARS_PER_SECOND = 20
 
@@ -21,16 +35,29 @@ class ScreencastGenerator:
         self.width = width
         self.height = height
         self.events = []
-        self.start_time = time.time()
+        # Time of the screencast, advanced by the delays instead of read from the clock
+        self.elapsed = 0.0
+        # Output since the last delay, written as one event
+        self.pending = []
+        self.pending_time = 0.0
 
     def add_output(self, text, delay=None):
-        """Add output event with optional delay from previous event"""
+        """Add output event with optional delay from previous event.
+        Output without a delay is merged into the current event."""
         if delay is None:
             delay = 1.0 / self.CHARS_PER_SECOND
         if delay > 0:
-            time.sleep(delay)
-        elapsed = time.time() - self.start_time
-        self.events.append([elapsed, "o", text])
+            self.flush()
+            self.elapsed += delay
+        if not self.pending:
+            self.pending_time = self.elapsed
+        self.pending.append(text)
+
+    def flush(self):
+        """Finish the current output event"""
+        if self.pending:
+            self.events.append([self.pending_time, "o", "".join(self.pending)])
+            self.pending = []
 
     def type_text(self, text, min_delay=0.05, max_delay=0.15):
         """Simulate typing text character by character"""
@@ -44,10 +71,17 @@ class ScreencastGenerator:
 
     def wait(self, duration):
         """Wait for specified duration"""
+        self.flush()
+        self.elapsed += duration
+
+    def wait_realtime(self, duration):
+        """Wait for specified duration, also in real time to give a running process time to respond"""
+        self.wait(duration)
         time.sleep(duration)
 
     def save(self, filename):
         """Save screencast to file"""
+        self.flush()
         header = {
             "version": 2,
             "width": self.width,
@@ -59,13 +93,75 @@ class ScreencastGenerator:
             }
         }
 
-        with open(filename, 'w') as f:
-            f.write(json.dumps(header) + '\n')
-            for event in self.events:
-                f.write(json.dumps(event) + '\n')
+        # One JSON document per line, written at once, compact in both cases
+        if orjson is not None:
+            lines = [orjson.dumps(header)] + [orjson.dumps(event) for event in self.events]
+        else:
+            lines = [json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+                     for obj in [header] + self.events]
+        with open(filename, 'wb') as f:
+            f.write(b'\n'.join(lines) + b'\n')
 
         print(f"Screencast saved to: {filename}")
 
+def wrap_text(text, line, col, first_col, last_col):
+    """Lay out text in a pane between first_col and last_col, starting at line and col.
+    Returns the rows as (line, col, text) and the line and col after the text."""
+    rows = []
+    row = []
+    row_line, row_col = line, col
+    for char in text:
+        if char == '\n' or col > last_col:
+            if row:
+                rows.append((row_line, row_col, ''.join(row)))
+                row = []
+            line += 1
+            col = first_col
+            if char == '\n':
+                continue
+        if not row:
+            row_line, row_col = line, col
+        row.append(char)
+        col += 1
+    if row:
+        rows.append((row_line, row_col, ''.join(row)))
+    return rows, line, col
+
+def layout_output(text, line, col, wrap):
+    """Lay out converter output in the left pane, starting at line and col.
+    Returns the runs of characters on a row as (line, col, text) and the line and col after the text.
+    Characters beyond the pane width wrap to the next line if wrap is set, otherwise they are dropped.
+    Output past the bottom of the pane continues on its last line."""
+    segments = []
+    row = []
+    row_line, row_col = line, col
+    for char in text:
+        if char == '\n':
+            if row:
+                segments.append((row_line, row_col, ''.join(row)))
+                row = []
+            line += 1
+            col = 1
+            if line >= 22:
+                # Scroll
+                line = 21
+        elif col < 40:
+            if not row:
+                row_line, row_col = line, col
+            row.append(char)
+            col += 1
+            if wrap and col >= 40:
+                segments.append((row_line, row_col, ''.join(row)))
+                row = []
+                line += 1
+                col = 1
+                if line >= 22:
+                    # Scroll, also keeps the line within CURSOR_TO
+                    line = 21
+    if row:
+        segments.append((row_line, row_col, ''.join(row)))
+    return segments, line, col
+
 def run_tmux_session():
     """Run the actual tmux session and capture output"""
 
@@ -92,13 +188,8 @@ def run_tmux_session():
         # Draw tmux layout with vertical split
         gen.wait(0.05)
 
-        # Clear screen and draw panes
-        for i in range(1, 23):
-            gen.add_output(f"\x1b[{i};1H\x1b[K", 0)  # Clear line
-
-        # Draw vertical separator at column 40
-        for i in range(1, 23):
-            gen.add_output(f"\x1b[{i};40H│", 0)
+        # Clear screen and draw panes, the frame is static and written at once
+        gen.add_output(PANES_FRAME, 0)
 
         # Draw status line
         gen.add_output("\x1b[23;1H\x1b[30m\x1b[42m", 0)
@@ -109,67 +200,44 @@ def run_tmux_session():
         # Left pane: show banner and docker command already entered and running (cursor waiting)
         banner1_text = "#\n# Processing JSON stream here\n#\n\n"
 
-        left_line = 1
-        col = 1
-
-        # Display banner1
-        for char in banner1_text:
-            if char == '\n':
-                left_line += 1
-                col = 1
-            elif col < 40:
-                gen.add_output(f"\x1b[{left_line};{col}H{char}", 0)
-                col += 1
-                if col >= 40:
-                    left_line += 1
-                    col = 1
+        # Display banner1, positioning each row once: the cursor advances over the characters
+        rows, left_line, col = wrap_text(banner1_text, 1, 1, 1, 39)
+        for row_line, row_col, row_text in rows:
+            gen.add_output(CURSOR_TO[row_line][row_col] + row_text, 0)
 
         # Add command with $ prefix
         docker_cmd = "$ cat example.pipe | docker run --rm -i olpa/ddb_convert --pretty --unbuffered from-ddb"
 
         # Display command with line wrapping
-        for char in docker_cmd:
-            if col > 39:
-                left_line += 1
-                col = 1
-            gen.add_output(f"\x1b[{left_line};{col}H{char}", 0)
-            col += 1
+        rows, left_line, col = wrap_text(docker_cmd, left_line, col, 1, 39)
+        for row_line, row_col, row_text in rows:
+            gen.add_output(CURSOR_TO[row_line][row_col] + row_text, 0)
 
         # Position cursor at start of next line in left pane (where output will appear)
         left_output_line = left_line + 1
-        gen.add_output(f"\x1b[{left_output_line};1H", 0)
+        gen.add_output(CURSOR_TO[left_output_line][1], 0)
 
         # Right pane: show banner and pv command already entered and running
         banner2_text = "#\n# Sending JSON\n#\n\n"
 
-        right_line = 1
-        col = 41
-
         # Display banner2
-        for char in banner2_text:
-            if char == '\n':
-                right_line += 1
-                col = 41
-            elif col <= 79:
-                gen.add_output(f"\x1b[{right_line};{col}H{char}", 0)
-                col += 1
-                if col > 79:
-                    right_line += 1
-                    col = 41
+        rows, right_line, col = wrap_text(banner2_text, 1, 41, 41, 79)
+        for row_line, row_col, row_text in rows:
+            gen.add_output(CURSOR_TO[row_line][row_col] + row_text, 0)
 
         # Add command with $ prefix
         pv_cmd = "$ pv -qL 20 example.json | tee example.pipe"
 
-        for char in pv_cmd:
-            if col > 79:
-                right_line += 1
-                col = 41
-            gen.add_output(f"\x1b[{right_line};{col}H{char}")
-            col += 1
+        # Typed character by character, positioned at the start of each row
+        rows, right_line, col = wrap_text(pv_cmd, right_line, col, 41, 79)
+        for row_line, row_col, row_text in rows:
+            gen.add_output(CURSOR_TO[row_line][row_col] + row_text[0])
+            for char in row_text[1:]:
+                gen.add_output(char)
 
         # Position cursor at start of next line in right pane (where output will appear)
         right_output_line = right_line + 1
-        gen.add_output(f"\x1b[{right_output_line};41H", 0)
+        gen.add_output(CURSOR_TO[right_output_line][41], 0)
 
         gen.wait(0.3)
 
@@ -187,7 +255,7 @@ def run_tmux_session():
 
         # Read the JSON file content
         print(f"Reading {example_json}...")
-        with open(example_json, 'r') as f:
+        with open(example_json, 'rb') as f:
             json_content = f.read()
 
         # Setup for feeding data at CHARS_PER_SECOND
@@ -202,105 +270,112 @@ def run_tmux_session():
         print(f"Feeding data at {chars_per_second} chars/second (unbuffered)...")
 
         # Feed data character by character at 20 chars/second
-        import select
+        import selectors
         import fcntl
 
         # Set docker stdout to non-blocking
-        flags = fcntl.fcntl(docker_process.stdout, fcntl.F_GETFL)
-        fcntl.fcntl(docker_process.stdout, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+        stdout_fd = docker_process.stdout.fileno()
+        flags = fcntl.fcntl(stdout_fd, fcntl.F_GETFL)
+        fcntl.fcntl(stdout_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+        # Track highlighted segments in left pane
+        highlighted_segments = []
 
-        # Track highlighted positions in left pane
-        highlighted_positions = []
+        # Where the terminal cursor is, if known: the right pane only moves it when needed
+        cursor = None
 
-        for char in json_content:
-            # Send to docker (unbuffered)
-            docker_process.stdin.write(char.encode('utf-8'))
-            docker_process.stdin.flush()
+        # Readiness of docker output, registered once instead of passed on every call
+        selector = selectors.DefaultSelector()
+        selector.register(stdout_fd, selectors.EVENT_READ)
 
-            # Display in right pane
+        # Set when docker closes its output
+        output_closed = False
+
+        # The content is sent as is, decoded only for display
+        decoder = codecs.getincrementaldecoder('utf-8')()
+
+        for i in range(len(json_content)):
+            # Send to docker (unbuffered, each write goes to the pipe)
+            byte = json_content[i:i + 1]
+            docker_process.stdin.write(byte)
+
+            # Display in right pane, a multi-byte character once it is complete
+            char = decoder.decode(byte)
             if char == '\n':
                 right_line += 1
                 right_col = 41
                 if right_line >= 22:
                     # Scroll right pane
                     right_line = 21
-            else:
+            elif char:
                 if right_col <= 79:
-                    gen.add_output(f"\x1b[{right_line};{right_col}H{char}", 0)
+                    if cursor == (right_line, right_col):
+                        gen.add_output(char, 0)
+                    else:
+                        gen.add_output(CURSOR_TO[right_line][right_col] + char, 0)
                     right_col += 1
-
-            # Check for docker output (non-blocking)
-            try:
-                ready, _, _ = select.select([docker_process.stdout], [], [], 0)
-                if ready:
-                    output_data = docker_process.stdout.read()
-                    if output_data:
+                    cursor = (right_line, right_col)
+
+            # Until the next character is due, wait for docker output and show it as soon
+            # as it arrives: the selector both paces the feed and polls, so there is no read
+            # without data and no separate sleep
+            deadline = time.monotonic() + delay_per_char
+            timeout = delay_per_char
+            while timeout > 0:
+                if output_closed:
+                    time.sleep(timeout)
+                    break
+                if selector.select(timeout):
+                    try:
+                        output_data = os.read(stdout_fd, 65536)
+                    except BlockingIOError:
+                        output_data = None
+                    if output_data == b'':
+                        output_closed = True
+                        selector.unregister(stdout_fd)
+                    elif output_data:
                         # Clear previous highlights
-                        for pos_line, pos_col, char in highlighted_positions:
-                            gen.add_output(f"\x1b[{pos_line};{pos_col}H{char}", 0)
-                        highlighted_positions = []
+                        for seg_line, seg_col, seg_text in highlighted_segments:
+                            gen.add_output(CURSOR_TO[seg_line][seg_col] + seg_text, 0)
 
-                        # Write new output with highlight
+                        # Write new output with highlight (reverse video), a row at a time,
+                        # and store the segments for later unhighlighting
                         output_str = output_data.decode('utf-8', errors='replace')
-                        for out_char in output_str:
-                            if out_char == '\n':
-                                left_line += 1
-                                left_col = 1
-                                if left_line >= 22:
-                                    left_line = 21
-                            else:
-                                if left_col < 40:
-                                    # Store position for later unhighlighting
-                                    highlighted_positions.append((left_line, left_col, out_char))
-                                    # Write with highlight (reverse video)
-                                    gen.add_output(f"\x1b[{left_line};{left_col}H\x1b[7m{out_char}\x1b[27m", 0)
-                                    left_col += 1
-            except:
-                pass
-
-            # Delay to achieve 20 chars/second
-            time.sleep(delay_per_char)
+                        highlighted_segments, left_line, left_col = layout_output(output_str, left_line, left_col, False)
+                        for seg_line, seg_col, seg_text in highlighted_segments:
+                            gen.add_output(f"{CURSOR_TO[seg_line][seg_col]}\x1b[7m{seg_text}\x1b[27m", 0)
+                        cursor = None
+                timeout = deadline - time.monotonic()
+
+            # Delay to achieve 20 chars/second, already waited in real time above
+            gen.wait(delay_per_char)
 
         # Close docker stdin
         docker_process.stdin.close()
+        selector.close()
 
         # Get remaining docker output
         print("Collecting remaining Docker output...")
-        time.sleep(0.5)  # Give docker time to finish processing
+        gen.wait_realtime(0.5)  # Give docker time to finish processing
 
         # Set back to blocking for final read
-        fcntl.fcntl(docker_process.stdout, fcntl.F_SETFL, flags)
+        fcntl.fcntl(stdout_fd, fcntl.F_SETFL, flags)
 
         remaining = docker_process.stdout.read().decode('utf-8', errors='replace')
         if remaining:
             # Clear previous highlights
-            for pos_line, pos_col, char in highlighted_positions:
-                gen.add_output(f"\x1b[{pos_line};{pos_col}H{char}", 0)
-            highlighted_positions = []
-
-            # Write remaining output with highlight
-            for char in remaining:
-                if char == '\n':
-                    left_line += 1
-                    left_col = 1
-                    if left_line >= 22:
-                        # Scroll
-                        left_line = 21
-                else:
-                    if left_col < 40:
-                        # Store position for later unhighlighting
-                        highlighted_positions.append((left_line, left_col, char))
-                        # Write with highlight
-                        gen.add_output(f"\x1b[{left_line};{left_col}H\x1b[7m{char}\x1b[27m", 0)
-                        left_col += 1
-                        if left_col >= 40:
-                            left_line += 1
-                            left_col = 1
+            for seg_line, seg_col, seg_text in highlighted_segments:
+                gen.add_output(CURSOR_TO[seg_line][seg_col] + seg_text, 0)
+
+            # Write remaining output with highlight, wrapping long lines
+            highlighted_segments, left_line, left_col = layout_output(remaining, left_line, left_col, True)
+            for seg_line, seg_col, seg_text in highlighted_segments:
+                gen.add_output(f"{CURSOR_TO[seg_line][seg_col]}\x1b[7m{seg_text}\x1b[27m", 0)
 
             # Clear final highlights after a moment
             gen.wait(0.5)
-            for pos_line, pos_col, char in highlighted_positions:
-                gen.add_output(f"\x1b[{pos_line};{pos_col}H{char}", 0)
+            for seg_line, seg_col, seg_text in highlighted_segments:
+                gen.add_output(CURSOR_TO[seg_line][seg_col] + seg_text, 0)
 
         # Wait for process to complete
         docker_process.wait()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the layout of the converter output in generate_screencast.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from generate_screencast import CURSOR_TO, layout_output  # noqa: E402
+
+
+def check_segments(segments):
+    """Assert that all segments are inside the left pane and have a cursor position"""
+    for line, col, text in segments:
+        assert 1 <= line <= 22 and col >= 1 and col + len(text) <= 40, \
+            f"Segment outside of the pane: {(line, col, text)}"
+        # Raises IndexError for positions that are not in the table
+        CURSOR_TO[line][col]
+
+
+def test_long_final_output_at_bottom():
+    """Wrapped final output starting at the bottom line stays in the pane"""
+    text = "x" * 200 + "\n" + "y" * 100
+    segments, line, col = layout_output(text, 22, 1, True)
+
+    check_segments(segments)
+    assert "".join(segment for _, _, segment in segments) == text.replace("\n", ""), \
+        "Characters are lost when wrapping"
+    assert (line, col) == (21, 1 + 100 % 39), f"Unexpected position after the output: {(line, col)}"
+
+
+def test_output_without_wrap():
+    """Without wrapping, characters beyond the pane width are dropped"""
+    segments, line, col = layout_output("x" * 50 + "\nab", 21, 1, False)
+
+    check_segments(segments)
+    assert segments == [(21, 1, "x" * 39), (21, 1, "ab")] and (line, col) == (21, 3), \
+        f"Unexpected layout: {segments} {(line, col)}"
+
+
+def main():
+    """Run all tests"""
+    tests = [
+        test_long_final_output_at_bottom,
+        test_output_without_wrap,
+    ]
+
+    failed = 0
+    for test_func in tests:
+        print(f"{test_func.__name__}: ", end="")
+        try:
+            test_func()
+        except AssertionError as e:
+            print(f"✗ FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ FAILED with exception: {e!r}")
+            failed += 1
+        else:
+            print("✓ PASSED")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())